@@ -3,6 +3,14 @@ ASGI config for djangoProject project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The database connection pool is opened here, i.e. once per worker
+(see ``djangoProject.db.warm_up_connections``).
+
+Under ASGI (``settings.ASGI_MODE``) list/retrieve/create of events and
+users are served by native async views using the async ORM, and the token
+endpoints verify passwords in a bounded thread pool. Other routes fall back
+to the sync DRF viewsets. Serve with ``./run_asgi.sh`` (uvicorn).
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
@@ -11,6 +19,11 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from djangoProject.db import warm_up_connections
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'djangoProject.settings')
+os.environ.setdefault('DJANGO_ASGI', 'True')
 
 application = get_asgi_application()
+
+warm_up_connections()
@@ -1,11 +1,68 @@
+import re
 from collections import OrderedDict
+from functools import cache
 from typing import Any
 
-from django.urls import include, re_path
+from django.urls import URLResolver, include, re_path
+from django.urls.resolvers import RegexPattern
 from rest_framework.routers import DefaultRouter, SimpleRouter
 from rest_framework.views import APIView
 from rest_framework.viewsets import ViewSetMixin
 
+# Литеральный первый сегмент в начале regex: ^events/, ^events$, ^events\.
+LITERAL_SEGMENT = re.compile(r'\^([\w-]*)(?:/|\\\.|\$|\\Z)')
+PATH_SEGMENT = re.compile(r'[^/.]*')
+
+
+@cache
+def nested_router_class() -> type | None:
+    """NestedSimpleRouter, если drf-nested-routers установлен (импорт один раз)."""
+    try:
+        from rest_framework_nested.routers import NestedSimpleRouter
+    except ImportError:
+        return None
+    return NestedSimpleRouter
+
+
+def first_segment(pattern) -> str | None:
+    """Литеральный первый сегмент паттерна или None, если он задан регуляркой."""
+    match = LITERAL_SEGMENT.match(pattern.pattern.regex.pattern)
+    return match[1] if match else None
+
+
+class PrefixDispatchResolver(URLResolver):
+    """
+    Резолвер с таблицей по первому сегменту пути.
+
+    Обычный URLResolver перебирает все паттерны подряд. Здесь паттерны
+    заранее разложены по первому литеральному сегменту (``events`` для
+    ``^events/...``), и запрос проверяет только свою группу. Паттерны,
+    у которых первый сегмент - регулярка, проверяются для любого пути;
+    порядок внутри группы совпадает с исходным, поэтому результат
+    тот же, что у плоского списка.
+
+    reverse() по-прежнему работает по полному url_patterns.
+    """
+
+    def __init__(self, urlpatterns: list[Any]):
+        super().__init__(RegexPattern(''), urlpatterns)
+        keys = [first_segment(pattern) for pattern in urlpatterns]
+        fallback = [pattern for pattern, key in zip(urlpatterns, keys) if key is None]
+
+        self.fallback = URLResolver(RegexPattern(''), fallback)
+        self.dispatch = {
+            key: URLResolver(RegexPattern(''), [
+                pattern for pattern, pattern_key in zip(urlpatterns, keys)
+                if pattern_key in (key, None)
+            ])
+            for key in dict.fromkeys(keys) if key is not None
+        }
+
+    def resolve(self, path):
+        path = str(path)
+        resolver = self.dispatch.get(PATH_SEGMENT.match(path)[0], self.fallback)
+        return resolver.resolve(path)
+
 
 class EnhancedAPIRouter(DefaultRouter):
     """
@@ -38,9 +95,11 @@ class EnhancedAPIRouter(DefaultRouter):
         Args:
             auto_basename: Автоматически генерировать basename для роутеров
             strict_checking: Использовать строгую проверку типов
+            dispatch_table: Отдавать паттерны через PrefixDispatchResolver
         """
         self.auto_basename = kwargs.pop('auto_basename', True)
         self.strict_checking = kwargs.pop('strict_checking', False)
+        self.dispatch_table = kwargs.pop('dispatch_table', True)
         super().__init__(*args, **kwargs)
 
     def register(
@@ -125,11 +184,8 @@ class EnhancedAPIRouter(DefaultRouter):
             router_types = [SimpleRouter, DefaultRouter]
 
             # Безопасно проверяем NestedSimpleRouter если доступен
-            try:
-                from rest_framework_nested.routers import NestedSimpleRouter
-                router_types.append(NestedSimpleRouter)
-            except ImportError:
-                pass
+            if nested_router_class() is not None:
+                router_types.append(nested_router_class())
 
             return isinstance(obj, tuple(router_types))
 
@@ -184,14 +240,16 @@ class EnhancedAPIRouter(DefaultRouter):
         Returns:
             True если объект является NestedSimpleRouter
         """
-        try:
-            from rest_framework_nested.routers import NestedSimpleRouter
-            return isinstance(obj, NestedSimpleRouter)
-        except ImportError:
-            return False
+        router_class = nested_router_class()
+        return router_class is not None and isinstance(obj, router_class)
 
     def get_urls(self) -> list[Any]:
-        """Генерирует список URL паттернов."""
+        """
+        Генерирует список URL паттернов.
+
+        Результат кэширует свойство urls (сбрасывается при register),
+        поэтому таблица диспетчеризации строится один раз.
+        """
         ret = []
 
         for prefix, viewset_or_router, basename in self.registry:
@@ -216,6 +274,8 @@ class EnhancedAPIRouter(DefaultRouter):
             root_url = re_path(r'^$', root_view, name=self.root_view_name)
             ret.append(root_url)
 
+        if self.dispatch_table:
+            return [PrefixDispatchResolver(ret)]
         return ret
 
     def _get_router_urls(self, prefix: str, router: Any, basename: str) -> list[
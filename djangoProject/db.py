@@ -0,0 +1,83 @@
+import logging
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+def get_pool(using: str = 'default'):
+    """Пул psycopg_pool соединения using или None (SQLite, пул выключен)."""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    return connection.pool
+
+
+def warm_up_connections(using: str = 'default') -> None:
+    """
+    Открывает пул соединений при старте воркера.
+
+    Ждет, пока пул наберет min_size соединений, чтобы первые запросы
+    не платили за подключение и TLS/auth. Вызывается после fork
+    (uwsgi --lazy-apps), иначе фоновые потоки пула останутся в мастере.
+    Недоступная БД не роняет воркер: пул дозаполнится сам.
+    """
+    pool = get_pool(using)
+    if pool is None:
+        # Без пула соединения живут в потоках запросов, греть нечего.
+        return
+
+    from psycopg_pool import PoolTimeout
+
+    try:
+        pool.open(wait=True, timeout=pool.timeout)
+    except PoolTimeout as e:
+        logger.warning('Database pool warm-up failed: %s', e)
+        return
+
+    logger.info('Database pool warmed up: %s', pool_stats(using))
+
+
+def pool_stats(using: str = 'default') -> dict[str, object]:
+    """Заполненность пула соединений текущего процесса."""
+    pool = get_pool(using)
+    if pool is None:
+        return {'enabled': False, 'vendor': connections[using].vendor}
+
+    stats = pool.get_stats()
+    size = stats.get('pool_size', 0)
+    available = stats.get('pool_available', 0)
+    return {
+        'enabled': True,
+        'min_size': pool.min_size,
+        'max_size': pool.max_size,
+        'size': size,
+        'in_use': size - available,
+        'available': available,
+        'waiting': stats.get('requests_waiting', 0),
+        'utilization': round((size - available) / pool.max_size, 3),
+        'errors': stats.get('requests_errors', 0),
+    }
+
+
+def probe_database(using: str = 'default', timeout: float | None = None) -> None:
+    """
+    Выполняет SELECT 1 на новом соединении драйвера и закрывает его.
+
+    Пул и постоянные соединения Django не затрагиваются, поэтому проба
+    не ждет DB_POOL_TIMEOUT и не оставляет за собой соединений.
+    """
+    connection = connections[using]
+    params = connection.get_connection_params()
+    if connection.vendor == 'postgresql' and timeout:
+        params['connect_timeout'] = max(1, round(timeout))
+
+    # Ошибки драйвера приводятся к django.db.DatabaseError.
+    with connection.wrap_database_errors:
+        conn = connection.Database.connect(**params)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        finally:
+            conn.close()
@@ -0,0 +1,295 @@
+import json
+import logging
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.module_loading import import_string
+from django.views import View
+
+from events_app.utils import metrics
+from events_app.utils.timing import RequestTimings, current_timings, install_query_timer, normalize_sql
+
+logger = logging.getLogger(__name__)
+
+
+def adapt(func, func_is_async: bool, is_async: bool):
+    """Приводит функцию к нужному режиму, как BaseHandler.adapt_method_mode."""
+    if is_async and not func_is_async:
+        return sync_to_async(func, thread_sensitive=True)
+    if func_is_async and not is_async:
+        return async_to_sync(func)
+    return func
+
+
+class MiddlewareChain:
+    """
+    Цепочка middleware поверх get_response, собранная так же,
+    как BaseHandler.load_middleware собирает MIDDLEWARE.
+
+    Хуки process_view/process_exception/process_template_response
+    вложенных middleware обработчик Django не видит, поэтому они
+    собираются здесь (всегда в синхронном виде) и вызываются
+    через PathScopedMiddleware.
+    """
+
+    def __init__(self, paths, get_response, is_async: bool):
+        self.view_hooks = []
+        self.template_response_hooks = []
+        self.exception_hooks = []
+
+        handler, handler_is_async = get_response, is_async
+        for path in reversed(paths):
+            middleware = import_string(path)
+            can_sync = getattr(middleware, 'sync_capable', True)
+            can_async = getattr(middleware, 'async_capable', False)
+            middleware_is_async = handler_is_async if can_sync and can_async else can_async
+            try:
+                instance = middleware(adapt(handler, handler_is_async, middleware_is_async))
+            except MiddlewareNotUsed:
+                continue
+
+            if hasattr(instance, 'process_view'):
+                self.view_hooks.insert(0, self.sync_hook(instance.process_view))
+            if hasattr(instance, 'process_template_response'):
+                self.template_response_hooks.append(self.sync_hook(instance.process_template_response))
+            if hasattr(instance, 'process_exception'):
+                self.exception_hooks.append(self.sync_hook(instance.process_exception))
+
+            handler, handler_is_async = convert_exception_to_response(instance), middleware_is_async
+
+        self.handler = adapt(handler, handler_is_async, is_async)
+
+    @staticmethod
+    def sync_hook(method):
+        return adapt(method, iscoroutinefunction(method), False)
+
+
+class PathScopedMiddleware:
+    """
+    Запускает PATH_SCOPED_MIDDLEWARE (сессии, CSRF, auth, messages)
+    только там, где они нужны.
+
+    Запросы к путям из PATH_SCOPED_LEAN_PREFIXES без cookie сессии
+    (JWT/Basic API, health-check) идут мимо этих middleware. Остальные,
+    включая admin/, auth/ и браузерный API с сессией, проходят полный
+    стек в том же порядке, что и раньше.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            # Для lean-запросов хуки не должны уходить в поток.
+            self.process_view = self.aprocess_view
+            self.process_exception = self.aprocess_exception
+            self.process_template_response = self.aprocess_template_response
+
+        self.lean_prefixes = tuple(settings.PATH_SCOPED_LEAN_PREFIXES)
+        self.lean = get_response
+        self.full = MiddlewareChain(settings.PATH_SCOPED_MIDDLEWARE, get_response, self.is_async)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self.dispatch(request)(request)
+
+    async def __acall__(self, request):
+        return await self.dispatch(request)(request)
+
+    def dispatch(self, request):
+        request.lean_middleware = self.is_lean(request)
+        return self.lean if request.lean_middleware else self.full.handler
+
+    def is_lean(self, request) -> bool:
+        return (
+            request.path_info.startswith(self.lean_prefixes)
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.lean_middleware:
+            return None
+        for hook in self.full.view_hooks:
+            response = hook(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_exception(self, request, exception):
+        if request.lean_middleware:
+            return None
+        for hook in self.full.exception_hooks:
+            response = hook(request, exception)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        if request.lean_middleware:
+            return response
+        for hook in self.full.template_response_hooks:
+            response = hook(request, response)
+        return response
+
+    async def aprocess_view(self, request, *args):
+        if request.lean_middleware:
+            return None
+        return await sync_to_async(PathScopedMiddleware.process_view)(self, request, *args)
+
+    async def aprocess_exception(self, request, exception):
+        if request.lean_middleware:
+            return None
+        return await sync_to_async(PathScopedMiddleware.process_exception)(self, request, exception)
+
+    async def aprocess_template_response(self, request, response):
+        if request.lean_middleware:
+            return response
+        return await sync_to_async(PathScopedMiddleware.process_template_response)(self, request, response)
+
+
+class RequestTimingMiddleware:
+    """
+    Замер времени запроса: всего, SQL (время и число запросов)
+    и сериализация EventSerializer/UserSerializer.
+
+    Итог отдается в заголовке Server-Timing; запросы дольше
+    SLOW_REQUEST_MS пишутся в лог одной JSON-строкой вместе
+    с нормализованным SQL самых медленных запросов. При выключенном
+    REQUEST_TIMING middleware не подключается вовсе.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_TIMING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+        connection_created.connect(install_query_timer)
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(connection=connection)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self.finish(request, response, timings)
+
+    def finish(self, request, response, timings):
+        total = timings.total
+        response['Server-Timing'] = (
+            f'total;dur={total * 1000:.1f}, '
+            f'db;dur={timings.db * 1000:.1f};desc="{len(timings.queries)} queries", '
+            f'serialize;dur={timings.serialize * 1000:.1f}'
+        )
+        if total * 1000 >= settings.SLOW_REQUEST_MS:
+            self.log_slow(request, response, timings, total)
+        return response
+
+    @staticmethod
+    def log_slow(request, response, timings, total):
+        match = request.resolver_match
+        logger.warning('slow request %s', json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'route': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 1),
+            'db_ms': round(timings.db * 1000, 1),
+            'queries': len(timings.queries),
+            'serialize_ms': round(timings.serialize * 1000, 1),
+            'slowest_queries': [
+                {'ms': round(elapsed * 1000, 2), 'sql': normalize_sql(sql)}
+                for elapsed, sql in timings.slowest_queries(settings.SLOW_REQUEST_QUERIES)
+            ],
+        }, ensure_ascii=False))
+
+
+class RequestMetricsMiddleware:
+    """
+    Пишет метрики запроса для /metrics: число, длительность, 5xx
+    и SQL по имени маршрута (event-list, user-me, ...).
+
+    SQL считается тем же сборщиком, что и у RequestTimingMiddleware;
+    если тот выключен, сборщик создается здесь.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+        connection_created.connect(install_query_timer)
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(connection=connection)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        timings, token = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            if token is not None:
+                current_timings.reset(token)
+        self.record(request, response, timings)
+        return response
+
+    async def __acall__(self, request):
+        timings, token = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            if token is not None:
+                current_timings.reset(token)
+        self.record(request, response, timings)
+        return response
+
+    @staticmethod
+    def start():
+        timings = current_timings.get()
+        if timings is not None:
+            return timings, None
+        timings = RequestTimings()
+        return timings, current_timings.set(timings)
+
+    @staticmethod
+    def record(request, response, timings):
+        match = request.resolver_match
+        route = (match.url_name or match.route) if match else 'unmatched'
+        method = request.method if request.method.lower() in View.http_method_names else 'other'
+        metrics.observe_request(
+            route, method, response.status_code, timings.total,
+            queries=len(timings.queries), db_seconds=timings.db,
+        )
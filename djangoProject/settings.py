@@ -1,6 +1,9 @@
 from pathlib import Path
 from datetime import timedelta
+from importlib.util import find_spec
 import os
+import tempfile
+from django.core.exceptions import ImproperlyConfigured
 from .utils import str_to_bool
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -27,6 +30,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'events_app.apps.EventsAppConfig',
     'rest_framework',
     'rest_framework_simplejwt',
@@ -35,15 +39,49 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'djangoProject.middleware.RequestTimingMiddleware',
+    'djangoProject.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'djangoProject.middleware.PathScopedMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+# Нужны только админке, djoser и сессиям. Запускаются из PathScopedMiddleware
+# для всех путей, кроме PATH_SCOPED_LEAN_PREFIXES без cookie сессии.
+PATH_SCOPED_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+PATH_SCOPED_LEAN_PREFIXES = ['/api/', '/healthz', '/readyz', '/metrics']
+
+# Server-Timing и лог медленных запросов (RequestTimingMiddleware).
+REQUEST_TIMING = str_to_bool(os.getenv("REQUEST_TIMING", "False"))
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+SLOW_REQUEST_QUERIES = int(os.getenv("SLOW_REQUEST_QUERIES", "3"))
+
+# Bearer-токен скрейпера и проб: с ним (или staff-пользователем) доступны
+# /metrics и подробности проверок /readyz. Пустой - только staff.
+MONITORING_TOKEN = os.getenv("MONITORING_TOKEN", "")
+
+# /metrics: prometheus_client в multiprocess-режиме, каждый процесс пишет
+# свои mmap-файлы в METRICS_DIR, скрейп их суммирует. Каталог очищается
+# при старте (run_uwsgi.sh, run_asgi.sh). Отдается staff-пользователям
+# и запросам с MONITORING_TOKEN.
+METRICS_ENABLED = str_to_bool(os.getenv("METRICS_ENABLED", "True"))
+METRICS_DIR = os.getenv("METRICS_DIR", os.path.join(tempfile.gettempdir(), "uniplace-metrics"))
+if METRICS_ENABLED:
+    # prometheus_client выбирает режим по окружению до первой метрики.
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = METRICS_DIR
+    os.makedirs(METRICS_DIR, exist_ok=True)
+# Как часто воркер переносит в файл статистику пула, кэша и auth, секунд.
+METRICS_SYNC_INTERVAL = float(os.getenv("METRICS_SYNC_INTERVAL", "5"))
+
+# Проверки админки ищут эти middleware прямо в MIDDLEWARE.
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
 
 ROOT_URLCONF = 'djangoProject.urls'
 
@@ -64,6 +102,20 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'djangoProject.wsgi.application'
+ASGI_APPLICATION = 'djangoProject.asgi.application'
+
+# Выставляется в djangoProject/asgi.py: под ASGI подключаются async-view.
+ASGI_MODE = str_to_bool(os.getenv("DJANGO_ASGI", "False"))
+
+# Пул соединений psycopg3 (пакет psycopg_pool из psycopg[binary,pool]).
+# С DB_POOL=False - постоянные соединения на поток с CONN_MAX_AGE.
+# На SQLite настройки ни на что не влияют.
+DB_POOL_ENABLED = str_to_bool(os.getenv("DB_POOL", "True"))
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_CONN_MAX_AGE = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+DB_CONN_HEALTH_CHECKS = str_to_bool(os.getenv("DB_CONN_HEALTH_CHECKS", "True"))
 
 if str_to_bool(os.getenv("DOCKER_PROJECT")):
     DATABASES = {
@@ -74,8 +126,26 @@ if str_to_bool(os.getenv("DOCKER_PROJECT")):
             "USER": os.getenv("DB_USER"),
             "PASSWORD": os.getenv("DB_PASS"),
             "PORT": "5432",
+            "CONN_HEALTH_CHECKS": DB_CONN_HEALTH_CHECKS,
         }
     }
+    if DB_POOL_ENABLED and find_spec("psycopg_pool") is None:
+        raise ImproperlyConfigured(
+            "DB_POOL включен, но psycopg_pool не установлен: "
+            "установите psycopg[binary,pool] или задайте DB_POOL=False"
+        )
+    if DB_POOL_ENABLED:
+        # Пул сам проверяет соединения при выдаче; CONN_MAX_AGE с пулом
+        # должен оставаться 0.
+        DATABASES["default"]["OPTIONS"] = {
+            "pool": {
+                "min_size": DB_POOL_MIN_SIZE,
+                "max_size": DB_POOL_MAX_SIZE,
+                "timeout": DB_POOL_TIMEOUT,
+            },
+        }
+    else:
+        DATABASES["default"]["CONN_MAX_AGE"] = DB_CONN_MAX_AGE
 else:
     DATABASES = {
         "default": {
@@ -84,6 +154,19 @@ else:
         }
     }
 
+# Локальный кэш процесса по умолчанию; для общего кэша между воркерами
+# задать CACHE_BACKEND/CACHE_LOCATION, например
+# django.core.cache.backends.redis.RedisCache и redis://redis:6379/0.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "uniplace"),
+    }
+}
+
+EVENTS_CACHE_ALIAS = "default"
+EVENTS_CACHE_TIMEOUT = int(os.getenv("EVENTS_CACHE_TIMEOUT", "300"))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -155,13 +238,33 @@ SIMPLE_JWT = {
     "SLIDING_TOKEN_REFRESH_SERIALIZER": "rest_framework_simplejwt.serializers.TokenRefreshSlidingSerializer",
 }
 
+# Кэш пользователей для CachedJWTAuthentication (в пределах процесса).
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "1024"))
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+
+# Префиксы путей, где Basic-аутентификация (PBKDF2 на каждый запрос) запрещена.
+AUTH_BASIC_DISABLED_PREFIXES = [
+    prefix for prefix in os.getenv("AUTH_BASIC_DISABLED_PREFIXES", "").split(",") if prefix
+]
+
+# Потоки для проверки паролей в асинхронном логине.
+AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "20"))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "100"))
+
+# Сколько первых участников встраивается в ответ события; полный
+# список - /api/events/{id}/participants/.
+EVENT_PARTICIPANTS_PREVIEW = int(os.getenv("EVENT_PARTICIPANTS_PREVIEW", "5"))
+
 REST_FRAMEWORK = {
+    # Bearer (JWT), Basic или сессия - по заголовку Authorization/cookie.
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        "rest_framework.authentication.BasicAuthentication",
-        "rest_framework.authentication.SessionAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "events_app.utils.authentication.SchemeDispatchAuthentication",
     ),
     'EXCEPTION_HANDLER': 'events_app.utils.exceptions.custom_exception_handler',
+    'DEFAULT_PAGINATION_CLASS': 'events_app.utils.pagination.IdCursorPagination',
+    'PAGE_SIZE': API_PAGE_SIZE,
 }
 
 DJOSER = {
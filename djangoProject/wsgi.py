@@ -3,6 +3,9 @@ WSGI config for djangoProject project.
 
 It exposes the WSGI callable as a module-level variable named ``application``.
 
+The database connection pool is opened here, i.e. once per worker
+(see ``djangoProject.db.warm_up_connections``).
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/wsgi/
 """
@@ -11,6 +14,10 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from djangoProject.db import warm_up_connections
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'djangoProject.settings')
 
 application = get_wsgi_application()
+
+warm_up_connections()
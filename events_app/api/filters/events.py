@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from djangoProject.utils import str_to_bool
+
+from events_app.models.tags import EventTagModel, parse_tags
+from events_app.utils.search import search_events
+
+
+class TagFilterBackend(BaseFilterBackend):
+    """
+    Фильтр событий по тегам: ``?tags=a,b&tags_mode=any|all``.
+
+    any - событие содержит хотя бы один тег, all - все перечисленные.
+    Выборка идет подзапросом по индексу (tag, event) таблицы связей,
+    без LIKE по строке тегов.
+    """
+
+    tags_param = 'tags'
+    mode_param = 'tags_mode'
+    modes = ('any', 'all')
+
+    def filter_queryset(self, request, queryset, view):
+        names = parse_tags(request.query_params.get(self.tags_param))
+        if not names:
+            return queryset
+
+        mode = request.query_params.get(self.mode_param, 'any')
+        if mode not in self.modes:
+            raise ValidationError({self.mode_param: f"Expected one of: {', '.join(self.modes)}"})
+
+        links = EventTagModel.objects.filter(tag__name__in=names)
+        if mode == 'all':
+            links = (
+                links.values('event_id')
+                .annotate(matched=Count('tag_id'))
+                .filter(matched=len(names))
+            )
+
+        return queryset.filter(id__in=links.values('event_id'))
+
+
+class TimeRangeFilterBackend(BaseFilterBackend):
+    """
+    Фильтр событий по времени начала: ``?from=``, ``?to=``, ``?upcoming=1``.
+
+    Границы включительные, принимаются ISO 8601 дата или дата со временем;
+    значения без зоны трактуются в TIME_ZONE, ``to`` в виде даты включает
+    весь день. Все условия - диапазон по индексу на EventModel.time.
+    """
+
+    from_param = 'from'
+    to_param = 'to'
+    upcoming_param = 'upcoming'
+
+    def parse_datetime(self, request, param):
+        value = request.query_params.get(param)
+        if not value:
+            return None
+        try:
+            return serializers.DateTimeField().to_internal_value(value)
+        except ValidationError as e:
+            raise ValidationError({param: e.detail})
+
+    def parse_until(self, request):
+        """Верхняя граница и признак строгого сравнения (дата без времени)."""
+        try:
+            day = parse_date(request.query_params.get(self.to_param) or '')
+        except ValueError:
+            day = None
+        if day is None:
+            return self.parse_datetime(request, self.to_param), False
+        # Весь день: до начала следующего в TIME_ZONE.
+        return timezone.make_aware(datetime.combine(day + timedelta(days=1), datetime.min.time())), True
+
+    def filter_queryset(self, request, queryset, view):
+        time_from = self.parse_datetime(request, self.from_param)
+        time_to, exclusive = self.parse_until(request)
+
+        if str_to_bool(request.query_params.get(self.upcoming_param)):
+            now = timezone.now()
+            time_from = max(time_from, now) if time_from else now
+
+        if time_from is not None:
+            queryset = queryset.filter(time__gte=time_from)
+        if time_to is not None:
+            queryset = queryset.filter(time__lt=time_to) if exclusive else queryset.filter(time__lte=time_to)
+        return queryset
+
+
+class SearchFilterBackend(BaseFilterBackend):
+    """
+    Полнотекстовый поиск ``?q=`` по title, location и description.
+
+    Результаты сортируются по релевантности; get_ordering подхватывает
+    курсорная пагинация, поэтому листание идет по (-rank, id).
+    """
+
+    search_param = 'q'
+    ordering = ('-rank', 'id')
+
+    def get_search_text(self, request):
+        return request.query_params.get(self.search_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        text = self.get_search_text(request)
+        if not text:
+            return queryset
+        return search_events(queryset, text)
+
+    def get_ordering(self, request, queryset, view):
+        if self.get_search_text(request):
+            return self.ordering
+        return None
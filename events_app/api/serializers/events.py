@@ -1,10 +1,48 @@
-from rest_framework.serializers import ModelSerializer
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import ModelSerializer, SerializerMethodField
 
 from events_app.api.serializers.users import UserSerializer
 from events_app.models.events import EventModel
+from events_app.utils.timing import TimedSerializerMixin
 
 
-class EventSerializer(ModelSerializer):
+def get_user_output_fields() -> list[str]:
+    """Поля пользователя, которые реально попадают в ответ UserSerializer."""
+    extra_kwargs = getattr(UserSerializer.Meta, 'extra_kwargs', {})
+    return [
+        field for field in UserSerializer.Meta.fields
+        if not extra_kwargs.get(field, {}).get('write_only')
+    ]
+
+
+def split_param(value: str | None) -> list[str]:
+    return [item.strip() for item in (value or '').split(',') if item.strip()]
+
+
+class EventSerializer(TimedSerializerMixin, ModelSerializer):
+    """
+    Событие с разреженными полями.
+
+    ``?fields=title,time`` ограничивает поля ответа (id есть всегда),
+    ``?expand=organizer,participants`` встраивает пользователей вместо id.
+    setup_eager_loading строит под эти параметры queryset, так что
+    незапрошенные связи не читаются вовсе.
+
+    Полный список участников не встраивается: в ответе participants_count
+    и первые EVENT_PARTICIPANTS_PREVIEW участников, остальные - через
+    /api/events/{id}/participants/. joined_users принимается только на запись
+    и не может превышать max_participants.
+    """
+
+    EXPANDABLE = ('organizer', 'participants')
+    PREVIEW_ATTR = 'participants_preview'
+
+    participants = SerializerMethodField()
+
     class Meta:
         model = EventModel
         fields = [
@@ -15,13 +53,115 @@ class EventSerializer(ModelSerializer):
             'description',
             'tags',
             'joined_users',
+            'participants',
+            'participants_count',
+            'max_participants',
+            'waitlist_enabled',
             'organizer'
         ]
+        extra_kwargs = {
+            # null в модели только для строк, не распознанных при миграции
+            'time': {'required': True, 'allow_null': False},
+            'joined_users': {'write_only': True},
+        }
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None and fields is None and expand is None:
+            fields, expand = self.get_sparse_params(request)
+
+        self.expand = set(expand or ())
+        # Запись принимает все поля, ограничивается только чтение.
+        if fields is not None and (request is None or request.method in SAFE_METHODS):
+            for name in set(self.fields) - set(fields) - {'id'}:
+                self.fields.pop(name)
+
+    @classmethod
+    def get_sparse_params(cls, request) -> tuple[list[str] | None, set[str]]:
+        """Разбирает ?fields= и ?expand=; неизвестные имена - ошибка 400."""
+        params = getattr(request, 'query_params', request.GET)
+        fields = split_param(params.get('fields')) or None
+        expand = set(split_param(params.get('expand')))
+
+        errors = {}
+        unknown = set(fields or ()) - cls.readable_fields()
+        if unknown:
+            errors['fields'] = [f'Unknown fields: {", ".join(sorted(unknown))}.']
+        unknown = expand - set(cls.EXPANDABLE)
+        if unknown:
+            errors['expand'] = [f'Cannot expand: {", ".join(sorted(unknown))}.']
+        if errors:
+            raise ValidationError(errors)
+
+        if fields is not None and request.method not in SAFE_METHODS:
+            fields = None
+        return fields, expand
+
+    @classmethod
+    def readable_fields(cls) -> set[str]:
+        return set(cls.Meta.fields) - {'joined_users'}
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None, expand=()):
+        """
+        Подгружает ровно то, что использует to_representation.
+
+        Столбцы события ограничиваются через only(); organizer забирается
+        через JOIN только при раскрытии (иначе хватает organizer_id),
+        превью участников - одним запросом на всю выборку (срез Prefetch
+        по оконной функции): только id или поля из UserSerializer при
+        раскрытии. Список событий обходится фиксированным числом запросов.
+        """
+        fields = set(fields or cls.readable_fields()) | {'id'}
+        user_fields = get_user_output_fields()
+
+        columns = fields - {'participants'}
+        if 'organizer' in columns and 'organizer' in expand:
+            columns |= {f'organizer__{name}' for name in user_fields}
+            queryset = queryset.select_related('organizer')
+        queryset = queryset.only(*columns)
+
+        if 'participants' in fields and settings.EVENT_PARTICIPANTS_PREVIEW:
+            users = get_user_model().objects.only(
+                *(user_fields if 'participants' in expand else ['id']))
+            users = users.order_by('id')[:settings.EVENT_PARTICIPANTS_PREVIEW]
+            queryset = queryset.prefetch_related(
+                Prefetch('joined_users', queryset=users, to_attr=cls.PREVIEW_ATTR))
+        return queryset
+
+    @staticmethod
+    def check_capacity(joined_users, max_participants) -> None:
+        """Список участников целиком должен помещаться в лимит события."""
+        if max_participants is None:
+            return
+        if len({user.pk for user in joined_users}) > max_participants:
+            raise ValidationError(
+                {'joined_users': [f'Event allows at most {max_participants} participants.']})
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        max_participants = attrs.get(
+            'max_participants', getattr(self.instance, 'max_participants', None))
+        if 'joined_users' in attrs:
+            self.check_capacity(attrs['joined_users'], max_participants)
+        elif self.instance is not None and max_participants is not None \
+                and self.instance.participants_count > max_participants:
+            raise ValidationError({'max_participants': [
+                f'Event already has {self.instance.participants_count} participants.']})
+        return attrs
+
+    def get_participants(self, instance):
+        preview = getattr(instance, self.PREVIEW_ATTR, None)
+        if preview is None:
+            # Объект не из setup_eager_loading (например, после create).
+            preview = instance.joined_users.order_by('id')[:settings.EVENT_PARTICIPANTS_PREVIEW]
+        if 'participants' in self.expand:
+            return UserSerializer(preview, many=True).data
+        return [user.pk for user in preview]
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        data["joined_users"] = UserSerializer(instance.joined_users.all(), many=True).data
-        data["organizer"] = UserSerializer(instance.organizer).data
+        if 'organizer' in data and 'organizer' in self.expand:
+            data["organizer"] = UserSerializer(instance.organizer).data
         return data
-
-
@@ -0,0 +1,98 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from events_app.utils.authentication import SchemeDispatchAuthentication
+from events_app.utils.exceptions import custom_exception_handler
+
+
+class AsyncAPIView(View):
+    """
+    Базовый асинхронный view для ASGI.
+
+    Делает то же, что APIView для JSON-клиентов: разбирает тело запроса
+    парсерами DRF, аутентифицирует через SchemeDispatchAuthentication,
+    проверяет permission_classes и превращает исключения DRF в ответы
+    через custom_exception_handler. Отвечает только JSON.
+
+    Методы из delegated_methods целиком передаются синхронному
+    ``fallback_view`` (обычно ModelViewSet.as_view), чтобы не дублировать
+    редкие операции записи.
+    """
+
+    parser_classes = (JSONParser, FormParser, MultiPartParser)
+    permission_classes = ()
+    renderer = JSONRenderer()
+
+    fallback_view = None
+    delegated_methods = ()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Как APIView.as_view: CSRF для сессий проверяет SessionAuthentication,
+        # JWT и Basic в проверке не нуждаются.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        # Через класс: иначе функция-view превратится в связанный метод.
+        fallback_view = type(self).fallback_view
+        if method in self.delegated_methods and fallback_view is not None:
+            return await sync_to_async(fallback_view)(request, *args, **kwargs)
+
+        drf_request = Request(request, parsers=[parser() for parser in self.parser_classes])
+        try:
+            handler = getattr(self, method, None) if method in self.http_method_names else None
+            if handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+
+            await self.initial(drf_request, method)
+            return await handler(drf_request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(exc, drf_request)
+
+    async def initial(self, request, method):
+        if request.authenticators:
+            # Request DRF подставляет ForcedAuthentication для APIClient.force_authenticate.
+            user_auth = request.authenticators[0].authenticate(request)
+        else:
+            user_auth = await SchemeDispatchAuthentication().aauthenticate(request)
+        request.user, request.auth = user_auth or (AnonymousUser(), None)
+
+        for permission in self.get_permissions(method):
+            if not permission.has_permission(request, self):
+                if not request.user.is_authenticated:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, 'message', None))
+
+    def get_permissions(self, method):
+        return [permission() for permission in self.permission_classes]
+
+    def handle_exception(self, exc, request):
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            exc.auth_header = SchemeDispatchAuthentication().authenticate_header(request)
+
+        response = custom_exception_handler(exc, {'view': self, 'request': request})
+        if response is None:
+            raise exc
+
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            response.status_code = status.HTTP_401_UNAUTHORIZED
+        return self.respond(response.data, status=response.status_code, headers=response.headers)
+
+    def respond(self, data, status=status.HTTP_200_OK, headers=None):
+        response = HttpResponse(
+            self.renderer.render(data),
+            status=status,
+            content_type='application/json',
+        )
+        for key, value in (headers or {}).items():
+            if key.lower() != 'content-type':
+                response[key] = value
+        return response
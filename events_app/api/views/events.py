@@ -1,25 +1,205 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
 from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.mixins import ListModelMixin
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
-from rest_framework.viewsets import ModelViewSet
+from rest_framework.viewsets import GenericViewSet, ModelViewSet
 
-from events_app.models.events import EventModel
-from events_app.api.serializers.events import EventSerializer
+from events_app.models.events import (
+    ALREADY_JOINED, FULL, JOINED, LEFT, WAITLISTED, EventModel)
+from events_app.api.filters.events import (
+    SearchFilterBackend, TagFilterBackend, TimeRangeFilterBackend)
+from events_app.api.serializers.events import EventSerializer, get_user_output_fields
+from events_app.api.serializers.users import UserSerializer
+from events_app.api.views.base import AsyncAPIView
+from events_app.utils.cache import (
+    EventCacheMixin, acached, aevent_detail_key, aevent_list_key, invalidate_events)
+from events_app.utils.export import (
+    DEFAULT_CHUNK_SIZE, EXPORT_CONTENT_TYPES, abatched_text, batched_text, export_lines)
+from events_app.utils.pagination import IdCursorPagination
+from events_app.utils.permissions import CustomIsAuthenticated
 
 
-class EventViewSet(ModelViewSet):
+def create_event(data, user, context=None):
+    serializer = EventSerializer(data=data, context=context or {})
+    serializer.is_valid(raise_exception=True)
+
+    if serializer.validated_data.get('joined_users') is None:
+        serializer.validated_data['joined_users'] = [user]
+    else:
+        serializer.validated_data['joined_users'].append(user)
+    # Организатор тоже занимает место.
+    serializer.check_capacity(
+        serializer.validated_data['joined_users'], serializer.validated_data.get('max_participants'))
+
+    serializer.validated_data['organizer'] = user
+    serializer.save()
+
+    return serializer.data
+
+
+class EventViewSet(EventCacheMixin, ModelViewSet):
     queryset = EventModel.objects.all()
     serializer_class = EventSerializer
+    filter_backends = [SearchFilterBackend, TagFilterBackend, TimeRangeFilterBackend]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields, expand = self.serializer_class.get_sparse_params(self.request)
+        return self.serializer_class.setup_eager_loading(queryset, fields, expand)
 
     def create(self, request, *args, **kwargs):
-        serializer = self.serializer_class(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        data = create_event(request.data, request.user, self.get_serializer_context())
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def perform_update(self, serializer):
+        # UPDATE строки события держит ее блокировку до конца транзакции:
+        # параллельный join ждет set() участников и видит новый счетчик.
+        with transaction.atomic():
+            instance = serializer.save()
+        # Превью из get_object() снято до save; to_attr DRF сам не сбрасывает.
+        instance.__dict__.pop(self.serializer_class.PREVIEW_ATTR, None)
+
+    @action(detail=True, methods=['post'], permission_classes=[CustomIsAuthenticated])
+    def join(self, request, pk=None):
+        return self.participation_response(pk, request.user, join=True)
+
+    @action(detail=True, methods=['post'], permission_classes=[CustomIsAuthenticated])
+    def leave(self, request, pk=None):
+        return self.participation_response(pk, request.user, join=False)
 
-        if serializer.validated_data.get('joined_users') is None:
-            serializer.validated_data['joined_users'] = [request.user]
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export(self, request):
+        """
+        Потоковая выгрузка событий: ?output=ndjson (по умолчанию) или csv.
+
+        Фильтры те же, что у списка; пагинации нет, память не зависит
+        от размера таблицы.
+        """
+        output = request.query_params.get('output', 'ndjson')
+        if output not in EXPORT_CONTENT_TYPES:
+            raise ValidationError({'output': [f'Expected one of: {", ".join(EXPORT_CONTENT_TYPES)}.']})
+
+        queryset = self.filter_queryset(EventModel.objects.all())
+        lines = export_lines(queryset, output, DEFAULT_CHUNK_SIZE)
+        if settings.ASGI_MODE:
+            content = abatched_text(lines, DEFAULT_CHUNK_SIZE)
         else:
-            serializer.validated_data['joined_users'].append(request.user)
+            content = batched_text(lines, DEFAULT_CHUNK_SIZE)
+
+        response = StreamingHttpResponse(content, content_type=EXPORT_CONTENT_TYPES[output])
+        response['Content-Disposition'] = f'attachment; filename="events.{output}"'
+        return response
+
+    def participation_response(self, pk, user, join):
+        # Без get_object(): список участников здесь не нужен.
+        event = get_object_or_404(
+            EventModel.objects.only('id', 'participants_count', 'waitlist_enabled'), pk=pk)
+        result = event.join(user) if join else event.leave(user)
+        if result in (JOINED, LEFT):
+            invalidate_events(event.pk)
+
+        if result == FULL:
+            return Response(
+                {"error": "event_full", "participants_count": event.participants_count},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        return Response({
+            'id': event.pk,
+            'status': result,
+            'joined': result in (JOINED, ALREADY_JOINED),
+            'participants_count': event.participants_count,
+        }, status=status.HTTP_202_ACCEPTED if result == WAITLISTED else status.HTTP_200_OK)
+
+
+class EventParticipantViewSet(ListModelMixin, GenericViewSet):
+    """
+    Участники события: /api/events/{event_pk}/participants/.
+
+    Keyset-пагинация по id пользователя; выборка идет по уникальному
+    индексу through-таблицы (eventmodel_id, customuser_id).
+    """
+
+    serializer_class = UserSerializer
+    pagination_class = IdCursorPagination
+
+    def get_queryset(self):
+        return get_user_model().objects.filter(
+            joined_users=self.kwargs['event_pk']).only(*get_user_output_fields())
+
+    def list(self, request, *args, **kwargs):
+        # Пустой список и несуществующее событие - разные ответы.
+        get_object_or_404(EventModel.objects.only('id'), pk=self.kwargs['event_pk'])
+        return super().list(request, *args, **kwargs)
+
+
+class AsyncEventMixin:
+    filter_backends = EventViewSet.filter_backends
+
+    def get_queryset(self, request):
+        fields, expand = EventSerializer.get_sparse_params(request)
+        return EventSerializer.setup_eager_loading(EventModel.objects.all(), fields, expand)
+
+    def filter_queryset(self, request, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(request, queryset, self)
+        return queryset
+
+
+class AsyncEventListView(AsyncEventMixin, AsyncAPIView):
+    """Асинхронные list/create событий для ASGI (см. EventViewSet)."""
+
+    http_method_names = ['get', 'post', 'options']
+    pagination_class = IdCursorPagination
+
+    def get_permissions(self, method):
+        if method == 'post':
+            return [CustomIsAuthenticated()]
+        return super().get_permissions(method)
+
+    async def get(self, request):
+        async def build():
+            queryset = self.filter_queryset(request, self.get_queryset(request))
+            paginator = self.pagination_class()
+            page = await paginator.apaginate_queryset(queryset, request, view=self)
+            data = EventSerializer(page, many=True, context={'request': request}).data
+            return paginator.get_paginated_response(data).data
+
+        data, hit = await acached(await aevent_list_key(request), build)
+        return self.respond(data, headers={'X-Cache': 'HIT' if hit else 'MISS'})
+
+    async def post(self, request):
+        data = request.data
+        result = await sync_to_async(create_event)(data, request.user, {'request': request})
+        return self.respond(result, status=status.HTTP_201_CREATED)
+
+
+class AsyncEventDetailView(AsyncEventMixin, AsyncAPIView):
+    """Асинхронный retrieve события; изменение и удаление уходят в EventViewSet."""
+
+    http_method_names = ['get', 'put', 'patch', 'delete', 'options']
+    delegated_methods = ('put', 'patch', 'delete')
+    fallback_view = EventViewSet.as_view({
+        'put': 'update',
+        'patch': 'partial_update',
+        'delete': 'destroy',
+    })
 
-        serializer.validated_data['organizer'] = request.user
-        serializer.save()
+    async def get(self, request, pk):
+        async def build():
+            try:
+                event = await self.get_queryset(request).aget(pk=pk)
+            except EventModel.DoesNotExist:
+                raise Http404(f"No {EventModel._meta.object_name} matches the given query.")
+            return EventSerializer(event, context={'request': request}).data
 
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        data, hit = await acached(await aevent_detail_key(request, int(pk)), build)
+        return self.respond(data, headers={'X-Cache': 'HIT' if hit else 'MISS'})
@@ -0,0 +1,69 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connections
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_GET
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import AllowAny
+
+from djangoProject.db import pool_stats
+from events_app.utils.authentication import MonitoringTokenAuthentication, SchemeDispatchAuthentication
+from events_app.utils.permissions import IsStaffOrMonitoring
+
+READY_CACHE_KEY = 'health:readyz'
+
+
+def check_database(using='default') -> dict[str, object]:
+    start = time.perf_counter()
+    try:
+        # Через соединение запроса (и пул), но без ORM-моделей.
+        with connections[using].cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except DatabaseError as e:
+        return {'ok': False, 'error': str(e).strip() or type(e).__name__}
+    return {'ok': True, 'latency_ms': round((time.perf_counter() - start) * 1000, 2)}
+
+
+def check_cache(alias=None) -> dict[str, object]:
+    cache = caches[alias or settings.EVENTS_CACHE_ALIAS]
+    start = time.perf_counter()
+    try:
+        cache.set(READY_CACHE_KEY, 1, 5)
+        ok = cache.get(READY_CACHE_KEY) == 1
+    except Exception as e:
+        # У каждого бэкенда (redis, memcached) свои исключения.
+        return {'ok': False, 'error': str(e).strip() or type(e).__name__}
+    return {'ok': ok, 'latency_ms': round((time.perf_counter() - start) * 1000, 2)}
+
+
+@never_cache
+@require_GET
+def healthz(request):
+    """Liveness: процесс жив и отвечает, внешние зависимости не проверяются."""
+    return JsonResponse({'status': 'ok'})
+
+
+@never_cache
+@api_view(['GET'])
+@authentication_classes([MonitoringTokenAuthentication, SchemeDispatchAuthentication])
+@permission_classes([AllowAny])
+def readyz(request):
+    """
+    Readiness: БД отвечает на SELECT 1, кэш на запись/чтение.
+
+    Анониму - только статус; проверки и пул видят staff
+    и запросы с MONITORING_TOKEN.
+    """
+    checks = {
+        'database': check_database(),
+        'cache': check_cache(),
+    }
+    ready = all(check['ok'] for check in checks.values())
+    body = {'status': 'ok' if ready else 'unavailable'}
+    if IsStaffOrMonitoring().has_permission(request, None):
+        body.update(checks=checks, pool=pool_stats())
+    return JsonResponse(body, status=200 if ready else 503)
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.cache import never_cache
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+
+from events_app.utils.authentication import MonitoringTokenAuthentication, SchemeDispatchAuthentication
+from events_app.utils.metrics import CONTENT_TYPE, render
+from events_app.utils.permissions import IsStaffOrMonitoring
+
+
+@never_cache
+@api_view(['GET'])
+@authentication_classes([MonitoringTokenAuthentication, SchemeDispatchAuthentication])
+@permission_classes([IsStaffOrMonitoring])
+def metrics(request):
+    """Метрики всех воркеров в формате Prometheus: читаются файлы, без блокировок."""
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
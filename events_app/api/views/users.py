@@ -1,6 +1,17 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
+from django.db import close_old_connections
+from django.http import Http404, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAdminUser, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -10,7 +21,12 @@ from rest_framework_simplejwt.serializers import (
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from djangoProject import settings
+from events_app.api.serializers.events import EventSerializer
 from events_app.api.serializers.users import UserSerializer
+from events_app.api.views.base import AsyncAPIView
+from events_app.api.views.events import EventViewSet
+from events_app.models.events import EventModel
+from events_app.utils.pagination import IdCursorPagination
 from events_app.utils.permissions import CustomIsAuthenticated
 
 
@@ -29,6 +45,36 @@ class UserViewSet(ModelViewSet):
 
         return Response(serializer.data)
 
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='me/events',
+        permission_classes=[CustomIsAuthenticated],
+        serializer_class=EventSerializer,
+        filter_backends=EventViewSet.filter_backends)
+    def my_events(self, request):
+        """
+        События текущего пользователя: ?role=joined (по умолчанию) или organized.
+
+        Выборка идет по индексу customuser_id through-таблицы или по
+        индексу organizer_id, поэтому стоимость зависит от числа событий
+        пользователя, а не от размера таблицы. Фильтры, ?fields= и
+        ?expand= - как у /api/events/.
+        """
+        role = request.query_params.get('role', 'joined')
+        if role == 'joined':
+            queryset = EventModel.objects.filter(joined_users=request.user)
+        elif role == 'organized':
+            queryset = EventModel.objects.filter(organizer=request.user)
+        else:
+            raise ValidationError({'role': ['Expected one of: joined, organized.']})
+
+        fields, expand = EventSerializer.get_sparse_params(request)
+        queryset = EventSerializer.setup_eager_loading(queryset, fields, expand)
+        page = self.paginate_queryset(self.filter_queryset(queryset))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     def get_permissions(self):
         if self.action in ['retrieve', 'destroy', 'list', 'partial_update']:
             return [IsAdminUser()]
@@ -86,3 +132,158 @@ class CustomTokenRefreshView(APIView):
         response = Response({"access": str(access_token)}, status=status.HTTP_200_OK)
 
         return response
+
+
+# Пул для проверки паролей: PBKDF2 отпускает GIL, поэтому потоки
+# действительно работают параллельно, а размер пула ограничивает нагрузку
+# на CPU и число соединений с БД.
+auth_executor = ThreadPoolExecutor(
+    max_workers=settings.AUTH_HASH_WORKERS,
+    thread_name_prefix='auth-hash',
+)
+
+
+def parse_request_data(request) -> dict:
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+    return request.POST.dict()
+
+
+def run_in_auth_executor(func, *args):
+    """Выполняет func в auth_executor и закрывает соединения потока после."""
+
+    def call():
+        try:
+            return func(*args)
+        finally:
+            # Поток пула живет дольше запроса: соединение закрываем или
+            # возвращаем по тем же правилам, что и в конце обычного запроса.
+            close_old_connections()
+
+    return sync_to_async(call, thread_sensitive=False, executor=auth_executor)()
+
+
+def create_user(data):
+    serializer = UserSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    return serializer.data
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncTokenObtainView(View):
+    """
+    Асинхронный аналог CustomTokenObtainView для ASGI.
+
+    Поиск пользователя и проверка пароля выполняются в auth_executor,
+    event loop в это время обслуживает остальные запросы.
+    """
+
+    http_method_names = ['post']
+    serializer_class = TokenObtainPairSerializer
+
+    async def post(self, request):
+        serializer = self.serializer_class(data=parse_request_data(request))
+
+        try:
+            await run_in_auth_executor(partial(serializer.is_valid, raise_exception=True))
+        except Exception:
+            # Как в CustomTokenObtainView: и ошибки полей, и неверный пароль.
+            return JsonResponse({"error": "invalid_data"}, status=status.HTTP_401_UNAUTHORIZED)
+
+        refresh_token = serializer.validated_data.pop("refresh")
+
+        response = JsonResponse({"access": serializer.validated_data.get("access")}, status=status.HTTP_200_OK)
+        response.set_cookie(
+            key="refresh_token",
+            value=str(refresh_token),
+            httponly=True,
+            secure=settings.SECURE_COOKIE,
+            samesite="Lax"
+        )
+
+        return response
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncTokenRefreshView(View):
+    """
+    Асинхронный аналог CustomTokenRefreshView для ASGI.
+
+    Обновление - только проверка подписи JWT без обращения к БД,
+    поэтому выполняется прямо в event loop.
+    """
+
+    http_method_names = ['post']
+
+    async def post(self, request):
+        refresh_token = request.COOKIES.get("refresh_token")
+
+        if refresh_token is None:
+            return JsonResponse(
+                {"error": "refresh_not_found", "step": "to_login"},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        try:
+            refresh_token = RefreshToken(refresh_token)
+            access_token = refresh_token.access_token
+        except Exception:
+            return JsonResponse(
+                {"error": "refresh_expired", "step": "to_login"},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        return JsonResponse({"access": str(access_token)}, status=status.HTTP_200_OK)
+
+
+class AsyncUserListView(AsyncAPIView):
+    """
+    Асинхронные list/create пользователей для ASGI (см. UserViewSet).
+
+    Регистрация хэширует пароль, поэтому выполняется в auth_executor.
+    """
+
+    http_method_names = ['get', 'post', 'options']
+    pagination_class = IdCursorPagination
+
+    def get_permissions(self, method):
+        if method == 'get':
+            return [IsAdminUser()]
+        return [AllowAny()]
+
+    async def get(self, request):
+        queryset = get_user_model().objects.all()
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(queryset, request, view=self)
+        data = UserSerializer(page, many=True, context={'request': request}).data
+        return self.respond(paginator.get_paginated_response(data).data)
+
+    async def post(self, request):
+        data = await run_in_auth_executor(create_user, request.data)
+        return self.respond(data, status=status.HTTP_201_CREATED)
+
+
+class AsyncUserDetailView(AsyncAPIView):
+    """Асинхронный retrieve пользователя; изменение и удаление уходят в UserViewSet."""
+
+    http_method_names = ['get', 'put', 'patch', 'delete', 'options']
+    permission_classes = (IsAdminUser,)
+    delegated_methods = ('put', 'patch', 'delete')
+    fallback_view = UserViewSet.as_view({
+        'put': 'update',
+        'patch': 'partial_update',
+        'delete': 'destroy',
+    })
+
+    async def get(self, request, pk):
+        user_model = get_user_model()
+        try:
+            user = await user_model.objects.aget(pk=pk)
+        except user_model.DoesNotExist:
+            raise Http404(f"No {user_model._meta.object_name} matches the given query.")
+        return self.respond(UserSerializer(user, context={'request': request}).data)
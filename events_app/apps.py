@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class EventsAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'events_app'
\ No newline at end of file
+    name = 'events_app'
+
+    def ready(self):
+        from events_app import signals  # noqa: F401
+        from events_app.utils.search import ensure_search_backend
+
+        post_migrate.connect(ensure_search_backend, sender=self)
@@ -0,0 +1,355 @@
+import json
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+from django.test.testcases import LiveServerThread
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from events_app.models import EventModel
+from events_app.utils.bench import benchmark_database, summarize
+
+PASSWORD = 'bench-password'
+QUERIES = re.compile(r'desc="(\d+) queries"')
+# Сравнение с базой: задержки в пределах --tolerance, запросов к БД не больше.
+COMPARED_LATENCY = 'p95_ms'
+
+
+def query_count(server_timing: str | None) -> int | None:
+    """Число SQL-запросов из заголовка Server-Timing (RequestTimingMiddleware)."""
+    match = QUERIES.search(server_timing or '')
+    return int(match[1]) if match else None
+
+
+class TestClientTransport:
+    """Запросы через django.test.Client, последовательно и без сети."""
+
+    concurrency = 1
+
+    def __init__(self):
+        self.client = Client()
+
+    def request(self, method, path, body=None, headers=None):
+        response = self.client.generic(
+            method, path,
+            data=json.dumps(body) if body is not None else '',
+            content_type='application/json',
+            headers=headers,
+        )
+        return response.status_code, response.get('Server-Timing')
+
+    def close(self):
+        pass
+
+
+class HTTPTransport:
+    """
+    Настоящий HTTP к LiveServerThread из пула потоков.
+
+    Тестовый сервер многопоточный, но закрывает соединения с БД после
+    каждого запроса, поэтому абсолютные цифры выше, чем у uwsgi с пулом.
+    """
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        # Статика и медиа бенчмарку не нужны.
+        self.server = LiveServerThread('localhost', static_handler=lambda handler: handler)
+        self.server.daemon = True
+        self.server.start()
+        self.server.is_ready.wait()
+        if self.server.error:
+            raise CommandError(f'Live server failed to start: {self.server.error}')
+        self.base_url = f'http://localhost:{self.server.port}'
+
+    def request(self, method, path, body=None, headers=None):
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(body).encode() if body is not None else None,
+            headers={'Content-Type': 'application/json', **(headers or {})},
+            method=method,
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+                return response.status, response.headers.get('Server-Timing')
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers.get('Server-Timing')
+
+    def close(self):
+        self.server.terminate()
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный бенчмарк API событий: сидирует N событий, M пользователей '
+        'и K участников на событие, гоняет list/retrieve/create/partial_update '
+        'событий, users/me и выдачу токенов через тестовый клиент или '
+        'параллельный HTTP и печатает p50/p95/p99, пропускную способность '
+        'и число SQL-запросов в JSON; с --baseline сравнивает с сохраненным прогоном.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=500, help='N событий')
+        parser.add_argument('--users', type=int, default=200, help='M пользователей')
+        parser.add_argument('--participants', type=int, default=10, help='K участников на событие')
+        parser.add_argument('--requests', type=int, default=200, help='Запросов на сценарий')
+        parser.add_argument('--auth-requests', type=int, default=10,
+                            help='Запросов на выдачу токена (каждый - PBKDF2)')
+        parser.add_argument('--warmup', type=int, default=5, help='Неучтенных запросов на сценарий')
+        parser.add_argument('--mode', choices=['client', 'http'], default='client')
+        parser.add_argument('--concurrency', type=int, default=8, help='Потоков в режиме http')
+        parser.add_argument('--only', nargs='+', help='Запустить только эти сценарии')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Записать результат в файл (например, как базу)')
+        parser.add_argument('--baseline', help='JSON прошлого прогона для сравнения')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help=f'Допустимый рост {COMPARED_LATENCY}, доля')
+
+    def handle(self, *args, **options):
+        if min(options['events'], options['users'], options['requests'], options['concurrency']) < 1:
+            raise CommandError('--events, --users, --requests and --concurrency must be positive')
+        if not 0 <= options['participants'] <= options['users']:
+            raise CommandError('--participants must be between 0 and --users')
+
+        baseline = self.load_baseline(options['baseline']) if options['baseline'] else None
+
+        with override_settings(
+            REQUEST_TIMING=True,
+            SLOW_REQUEST_MS=float('inf'),
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+        ), benchmark_database():
+            rng = random.Random(options['seed'])
+            data = self.seed(rng, options)
+            scenarios = self.scenarios(data, options)
+            if options['only']:
+                unknown = set(options['only']) - set(scenarios)
+                if unknown:
+                    raise CommandError(f'Unknown scenarios: {", ".join(sorted(unknown))}')
+                scenarios = {name: scenarios[name] for name in options['only']}
+
+            transport = (
+                HTTPTransport(options['concurrency']) if options['mode'] == 'http'
+                else TestClientTransport()
+            )
+            try:
+                results = {
+                    name: self.run_scenario(transport, make_request, count, options['warmup'], rng)
+                    for name, (make_request, count) in scenarios.items()
+                }
+            finally:
+                transport.close()
+                connections.close_all()
+
+        report = {
+            'config': {
+                key: options[key] for key in
+                ('mode', 'events', 'users', 'participants', 'requests', 'auth_requests', 'seed')
+            } | {
+                'concurrency': transport.concurrency,
+                'vendor': connections['default'].vendor,
+            },
+            'results': results,
+        }
+        if baseline is not None:
+            report['comparison'] = self.compare(report, baseline, options['tolerance'])
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            Path(options['output']).write_text(output + '\n')
+        self.stdout.write(output)
+
+        if baseline is not None and report['comparison']['regressions']:
+            raise CommandError(
+                'Performance regressions: ' + ', '.join(report['comparison']['regressions']))
+
+    @staticmethod
+    def load_baseline(path: str) -> dict:
+        try:
+            return json.loads(Path(path).read_text())
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read baseline {path}: {e}')
+
+    def seed(self, rng, options) -> dict:
+        user_model = get_user_model()
+        # Один хэш на всех: PBKDF2 на каждого пользователя сидировал бы минутами.
+        password = make_password(PASSWORD)
+        user_model.objects.bulk_create(
+            user_model(username=f'bench{i}', email=f'bench{i}@example.com', password=password)
+            for i in range(options['users'])
+        )
+        user_ids = list(user_model.objects.order_by('id').values_list('id', flat=True))
+
+        now = timezone.now()
+        events = EventModel.objects.bulk_create(
+            EventModel(
+                title=f'Bench event {i}',
+                time=now + timedelta(hours=rng.randrange(24 * 90)),
+                location=f'Room {rng.randrange(100)}',
+                description='Benchmark event',
+                tags='',
+                organizer_id=rng.choice(user_ids),
+                participants_count=options['participants'],
+            )
+            for i in range(options['events'])
+        )
+        through = EventModel.joined_users.through
+        through.objects.bulk_create(
+            (
+                through(eventmodel_id=event.pk, customuser_id=user_id)
+                for event in events
+                for user_id in rng.sample(user_ids, options['participants'])
+            ),
+            batch_size=1000,
+        )
+
+        users = list(user_model.objects.filter(pk__in=rng.sample(user_ids, min(20, len(user_ids)))))
+        return {
+            'event_ids': [event.pk for event in events],
+            'users': users,
+            'access': [str(RefreshToken.for_user(user).access_token) for user in users],
+        }
+
+    def scenarios(self, data, options) -> dict:
+        """Имя -> (фабрика запроса от rng, число запросов)."""
+        event_ids, users, access = data['event_ids'], data['users'], data['access']
+        requests = options['requests']
+
+        def bearer(rng):
+            return {'Authorization': f'Bearer {rng.choice(access)}'}
+
+        def refresh_cookie(rng):
+            # Сам refresh-токен дешевый: выдаем без PBKDF2.
+            return {'Cookie': f'refresh_token={RefreshToken.for_user(rng.choice(users))}'}
+
+        def time_from(rng):
+            # Каждый раз новый ключ кэша: список собирается из БД.
+            start = timezone.now() + timedelta(seconds=rng.randrange(30 * 24 * 3600))
+            return urlencode({'from': start.isoformat()})
+
+        def new_event(rng):
+            return {
+                'title': f'Created {rng.randrange(10 ** 6)}',
+                'time': (timezone.now() + timedelta(days=rng.randrange(1, 30))).isoformat(),
+                'location': 'Bench hall',
+                'description': 'Created by bench_api',
+                'tags': 'bench',
+            }
+
+        return {
+            'events.list': (lambda rng: ('GET', '/api/events/', None, None, 200), requests),
+            'events.list_uncached': (
+                lambda rng: ('GET', f'/api/events/?{time_from(rng)}', None, None, 200), requests),
+            'events.retrieve': (
+                lambda rng: ('GET', f'/api/events/{rng.choice(event_ids)}/', None, None, 200), requests),
+            'events.create': (
+                lambda rng: ('POST', '/api/events/', new_event(rng), bearer(rng), 201), requests),
+            'events.partial_update': (
+                lambda rng: ('PATCH', f'/api/events/{rng.choice(event_ids)}/',
+                             {'title': f'Updated {rng.randrange(10 ** 6)}'}, bearer(rng), 200),
+                requests),
+            'users.me': (lambda rng: ('GET', '/api/users/me/', None, bearer(rng), 200), requests),
+            'token.obtain': (
+                lambda rng: ('POST', '/api/token/',
+                             {'email': rng.choice(users).email, 'password': PASSWORD}, None, 200),
+                options['auth_requests']),
+            'token.refresh': (
+                lambda rng: ('POST', '/api/token/refresh/', None, refresh_cookie(rng), 200), requests),
+        }
+
+    def run_scenario(self, transport, make_request, count, warmup, rng) -> dict:
+        # Запросы строятся заранее, чтобы rng не делился между потоками.
+        planned = [make_request(rng) for _ in range(warmup + count)]
+        for method, path, body, headers, _ in planned[:warmup]:
+            transport.request(method, path, body, headers)
+
+        latencies, queries, errors = [], [], []
+        lock = threading.Lock()
+
+        def call(planned_request):
+            method, path, body, headers, expected = planned_request
+            start = time.perf_counter()
+            status, server_timing = transport.request(method, path, body, headers)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                executed = query_count(server_timing)
+                if executed is not None:
+                    queries.append(executed)
+                if status != expected:
+                    errors.append(status)
+
+        start = time.perf_counter()
+        if transport.concurrency > 1:
+            with ThreadPoolExecutor(max_workers=transport.concurrency) as executor:
+                list(executor.map(call, planned[warmup:]))
+        else:
+            for planned_request in planned[warmup:]:
+                call(planned_request)
+        wall_time = time.perf_counter() - start
+
+        return {
+            'requests': count,
+            'errors': len(errors),
+            'error_statuses': sorted(set(errors)),
+            'wall_time_s': round(wall_time, 3),
+            'throughput_per_s': round(count / wall_time, 1) if wall_time else 0.0,
+            'latency': summarize(latencies),
+            'queries': {
+                'mean': round(sum(queries) / len(queries), 2) if queries else None,
+                'max': max(queries, default=None),
+            },
+        }
+
+    @staticmethod
+    def compare(report, baseline, tolerance) -> dict:
+        mismatched = sorted(
+            key for key, value in report['config'].items()
+            if baseline.get('config', {}).get(key) != value
+        )
+        scenarios, regressions = {}, []
+        for name, current in report['results'].items():
+            previous = baseline.get('results', {}).get(name)
+            if previous is None:
+                continue
+
+            latency, base_latency = current['latency'][COMPARED_LATENCY], previous['latency'][COMPARED_LATENCY]
+            queries, base_queries = current['queries']['mean'], previous['queries']['mean']
+            row = {
+                COMPARED_LATENCY: latency,
+                f'baseline_{COMPARED_LATENCY}': base_latency,
+                'latency_ratio': round(latency / base_latency, 3) if base_latency else None,
+                'throughput_ratio': (
+                    round(current['throughput_per_s'] / previous['throughput_per_s'], 3)
+                    if previous['throughput_per_s'] else None
+                ),
+                'queries': queries,
+                'baseline_queries': base_queries,
+            }
+            row['latency_regression'] = bool(base_latency) and latency > base_latency * (1 + tolerance)
+            row['query_regression'] = (
+                queries is not None and base_queries is not None and queries > base_queries
+            )
+            if row['latency_regression'] or row['query_regression'] or current['errors'] > previous['errors']:
+                regressions.append(name)
+            scenarios[name] = row
+
+        return {
+            'tolerance': tolerance,
+            'config_mismatch': mismatched,
+            'scenarios': scenarios,
+            'regressions': regressions,
+        }
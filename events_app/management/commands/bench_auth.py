@@ -0,0 +1,78 @@
+import asyncio
+import json
+import time
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, override_settings
+from django.urls import path
+
+from events_app.api.views.events import EventViewSet
+from events_app.api.views.users import AsyncTokenObtainView, CustomTokenObtainView
+from events_app.utils.bench import benchmark_database, summarize
+
+PASSWORD = 'bench-password'
+
+
+def make_urlconf(token_view):
+    # Класс, а не модуль: ROOT_URLCONF нужен только атрибут urlpatterns.
+    class URLConf:
+        urlpatterns = [
+            path('token/', token_view.as_view()),
+            path('events/', EventViewSet.as_view({'get': 'list'})),
+        ]
+
+    return URLConf
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает задержку чтения /events/ во время параллельных логинов '
+        'для sync (CustomTokenObtainView) и async (AsyncTokenObtainView) view под ASGI.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=4, help='Параллельных логинов')
+        parser.add_argument('--reads', type=int, default=50, help='Чтений списка событий')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            get_user_model().objects.create_user(
+                username='bench@example.com', email='bench@example.com', password=PASSWORD)
+
+            results = {}
+            for mode, view in (('sync', CustomTokenObtainView), ('async', AsyncTokenObtainView)):
+                with override_settings(ROOT_URLCONF=make_urlconf(view)):
+                    results[mode] = async_to_sync(self.run_round)(options['logins'], options['reads'])
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    async def run_round(self, logins: int, reads: int) -> dict:
+        client = AsyncClient()
+        credentials = {'email': 'bench@example.com', 'password': PASSWORD}
+
+        async def login():
+            response = await client.post('/token/', credentials, content_type='application/json')
+            assert response.status_code == 200, response.content
+
+        async def read_events(latencies):
+            for _ in range(reads):
+                start = time.perf_counter()
+                response = await client.get('/events/')
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.content
+
+        # Прогрев: первый запрос импортирует и кэширует лишнее.
+        await client.get('/events/')
+
+        latencies = []
+        start = time.perf_counter()
+        await asyncio.gather(read_events(latencies), *(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+
+        return {
+            'logins': logins,
+            'wall_time_s': round(elapsed, 3),
+            'reads_during_logins': summarize(latencies),
+        }
@@ -0,0 +1,135 @@
+import json
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections
+
+from events_app.models import EventModel
+from events_app.models.events import LEFT
+from events_app.utils.bench import benchmark_database, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест записи на событие с лимитом мест: параллельные '
+        'join из пула потоков, проверка отсутствия перебора и пропускная способность.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200, help='Желающих записаться')
+        parser.add_argument('--capacity', type=int, default=50, help='max_participants события')
+        parser.add_argument('--workers', type=int, default=16, help='Потоков')
+        parser.add_argument('--waitlist', action='store_true', help='Включить лист ожидания')
+        parser.add_argument('--leaves', type=int, default=0, help='Сколько участников потом выходят')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            user_model = get_user_model()
+            user_model.objects.bulk_create(
+                user_model(username=f'bench{i}', email=f'bench{i}@example.com')
+                for i in range(options['users'])
+            )
+            users = list(user_model.objects.order_by('id'))
+            event = EventModel.objects.create(
+                title='bench', location='', description='', tags='',
+                max_participants=options['capacity'],
+                waitlist_enabled=options['waitlist'],
+            )
+
+            report = {
+                'vendor': connections['default'].vendor,
+                'users': len(users),
+                'capacity': options['capacity'],
+                'workers': options['workers'],
+                'join': self.run_phase(event.pk, users, 'join', options['workers']),
+            }
+
+            if options['leaves']:
+                leaving = list(event.joined_users.order_by('id')[:options['leaves']])
+                report['leave'] = self.run_phase(event.pk, leaving, 'leave', options['workers'])
+
+            report['checks'] = checks = self.check_event(event, options)
+
+        self.stdout.write(json.dumps(report, indent=2))
+        if not checks['ok']:
+            raise CommandError('Participant invariants violated')
+
+    def run_phase(self, event_pk, users, method, workers):
+        latencies = []
+        results = Counter()
+        lock = threading.Lock()
+
+        def call(user):
+            # Свой объект на поток: join/leave обновляют participants_count.
+            event = EventModel.objects.only(
+                'id', 'participants_count', 'waitlist_enabled').get(pk=event_pk)
+            start = time.perf_counter()
+            try:
+                result = getattr(event, method)(user)
+            except DatabaseError as e:
+                result = f'error: {type(e).__name__}'
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                results[result] += 1
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            start = time.perf_counter()
+            list(executor.map(call, users))
+            wall_time = time.perf_counter() - start
+
+            # По задаче на поток: закрываем соединения всех потоков пула,
+            # иначе тестовую БД PostgreSQL не удалить.
+            barrier = threading.Barrier(workers)
+
+            def close_connections(_):
+                barrier.wait()
+                connections.close_all()
+
+            list(executor.map(close_connections, range(workers)))
+
+        return {
+            'calls': len(users),
+            'wall_time_s': round(wall_time, 3),
+            'throughput_per_s': round(len(users) / wall_time, 1) if wall_time else 0.0,
+            'results': dict(results),
+            'latency': summarize(latencies),
+        }
+
+    def check_event(self, event, options):
+        event.refresh_from_db()
+        joined = event.joined_users.count()
+        waitlisted = event.waitlist.count()
+        left = options['leaves']
+
+        expected_joined = min(options['users'], options['capacity'])
+        if options['waitlist']:
+            # Ушедших заменяют ожидающие, пока очередь не кончится.
+            expected_waitlist = max(options['users'] - options['capacity'], 0)
+            promoted = min(left, expected_waitlist)
+            expected_joined = expected_joined - left + promoted
+            expected_waitlist -= promoted
+        else:
+            expected_joined -= left
+            expected_waitlist = 0
+
+        checks = {
+            'joined': joined,
+            'participants_count': event.participants_count,
+            'waitlisted': waitlisted,
+            'expected_joined': expected_joined,
+            'expected_waitlisted': expected_waitlist,
+            'overbooked': joined > options['capacity'],
+            'counter_matches': joined == event.participants_count,
+        }
+        checks['ok'] = (
+            not checks['overbooked']
+            and checks['counter_matches']
+            and joined == expected_joined
+            and waitlisted == expected_waitlist
+        )
+        return checks
@@ -0,0 +1,90 @@
+import json
+import time
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+from django.urls import path
+
+from events_app.utils.bench import summarize
+
+SCOPED = 'djangoProject.middleware.PathScopedMiddleware'
+PATHS = ('/api/ping/', '/auth/ping/')
+
+
+def ping(request):
+    return HttpResponse('ok')
+
+
+class URLConf:
+    urlpatterns = [path(url.strip('/') + '/', ping) for url in PATHS]
+
+
+def flat_middleware() -> list[str]:
+    """Прежний MIDDLEWARE: PATH_SCOPED_MIDDLEWARE на месте диспетчера."""
+    middleware = []
+    for name in settings.MIDDLEWARE:
+        middleware.extend(settings.PATH_SCOPED_MIDDLEWARE if name == SCOPED else [name])
+    return middleware
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает накладные расходы middleware на запрос: прежний плоский '
+        'MIDDLEWARE и PathScopedMiddleware, для /api/ и /auth/, sync и async.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000, help='Запросов на замер')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests must be positive')
+
+        stacks = {'flat': flat_middleware(), 'scoped': list(settings.MIDDLEWARE)}
+        results = {}
+        for is_async in (False, True):
+            for url in PATHS:
+                row = {}
+                for mode, middleware in stacks.items():
+                    with override_settings(MIDDLEWARE=middleware, ROOT_URLCONF=URLConf,
+                                           ALLOWED_HOSTS=['testserver']):
+                        row[mode] = self.measure(url, is_async, options['requests'])
+                row['saved_us'] = round(row['flat']['mean_us'] - row['scoped']['mean_us'], 2)
+                results[f'{"async" if is_async else "sync"} {url}'] = row
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def measure(self, url: str, is_async: bool, requests: int) -> dict:
+        handler = BaseHandler()
+        handler.load_middleware(is_async=is_async)
+        if is_async:
+            latencies = async_to_sync(self.run_async)(handler, url, requests)
+        else:
+            factory = RequestFactory()
+            latencies = []
+            for _ in range(requests):
+                request = factory.get(url)
+                start = time.perf_counter()
+                response = handler.get_response(request)
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.status_code
+
+        stats = summarize(latencies)
+        stats['mean_us'] = round(sum(latencies) / len(latencies) * 1e6, 2)
+        return stats
+
+    @staticmethod
+    async def run_async(handler, url: str, requests: int) -> list[float]:
+        factory = AsyncRequestFactory()
+        latencies = []
+        for _ in range(requests):
+            request = factory.get(url)
+            start = time.perf_counter()
+            response = await handler.get_response_async(request)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.status_code
+        return latencies
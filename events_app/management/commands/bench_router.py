@@ -0,0 +1,78 @@
+import json
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import URLResolver, include, path
+from django.urls.resolvers import RegexPattern
+from rest_framework import viewsets
+from rest_framework.response import Response
+
+from djangoProject.custom_router import EnhancedAPIRouter
+from events_app.utils.bench import summarize
+
+
+class BenchViewSet(viewsets.ViewSet):
+    def list(self, request):
+        return Response([])
+
+    def retrieve(self, request, pk=None):
+        return Response({})
+
+
+def build_resolver(routes: int, dispatch_table: bool) -> URLResolver:
+    router = EnhancedAPIRouter(dispatch_table=dispatch_table)
+    for i in range(routes):
+        router.register(f'resource{i}', BenchViewSet, f'resource{i}')
+    # Так же, как get_resolver() строит корневой резолвер из ROOT_URLCONF.
+    return URLResolver(RegexPattern(r'^/'), [path('api/', include(router.urls))])
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время resolve() для плоского списка паттернов EnhancedAPIRouter '
+        'и таблицы по первому сегменту (PrefixDispatchResolver).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--routes', type=int, nargs='+', default=[10, 100, 1000],
+                            help='Сколько ViewSet регистрировать')
+        parser.add_argument('--requests', type=int, default=2000, help='Резолвов на замер')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or any(n < 1 for n in options['routes']):
+            raise CommandError('--routes and --requests must be positive')
+
+        results = {}
+        for routes in options['routes']:
+            rng = random.Random(options['seed'])
+            paths = [
+                f'/api/resource{i}/' if rng.random() < 0.5 else f'/api/resource{i}/{i}/'
+                for i in (rng.randrange(routes) for _ in range(options['requests']))
+            ]
+
+            row = {}
+            for mode, dispatch_table in (('flat', False), ('dispatch', True)):
+                resolver = build_resolver(routes, dispatch_table)
+                # Прогрев: первый resolve компилирует регулярки.
+                for url in paths[:routes]:
+                    resolver.resolve(url)
+                row[mode] = self.measure(resolver, paths)
+
+            row['speedup'] = round(row['flat']['mean_us'] / row['dispatch']['mean_us'], 1)
+            results[routes] = row
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    @staticmethod
+    def measure(resolver, paths: list[str]) -> dict:
+        latencies = []
+        for url in paths:
+            start = time.perf_counter()
+            resolver.resolve(url)
+            latencies.append(time.perf_counter() - start)
+
+        stats = summarize(latencies)
+        stats['mean_us'] = round(sum(latencies) / len(latencies) * 1e6, 2)
+        return stats
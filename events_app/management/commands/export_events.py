@@ -0,0 +1,48 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from events_app.models import EventModel
+from events_app.utils.export import DEFAULT_CHUNK_SIZE, batched_text, format_rows, iter_events
+
+
+class Command(BaseCommand):
+    help = 'Потоковая выгрузка всех событий в NDJSON или CSV (файл или stdout).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-', help='Файл или "-" для stdout')
+        parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Событий в пачке')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        if chunk_size < 1:
+            raise CommandError('--chunk-size must be positive')
+
+        if options['path'] == '-':
+            stream = open(sys.stdout.fileno(), 'w', encoding='utf-8', newline='', closefd=False)
+        else:
+            try:
+                stream = open(options['path'], 'w', encoding='utf-8', newline='')
+            except OSError as e:
+                raise CommandError(e)
+
+        exported = 0
+
+        def counted(rows):
+            nonlocal exported
+            for row in rows:
+                exported += 1
+                yield row
+
+        start = time.perf_counter()
+        with stream:
+            rows = counted(iter_events(EventModel.objects.all(), chunk_size))
+            for block in batched_text(format_rows(rows, options['format']), chunk_size):
+                stream.write(block)
+        elapsed = time.perf_counter() - start
+
+        # stdout может быть занят выгрузкой, поэтому сводка - в stderr.
+        rate = exported / elapsed if elapsed else 0.0
+        self.stderr.write(f'Exported {exported} events in {elapsed:.3f} s ({rate:.1f} events/s)')
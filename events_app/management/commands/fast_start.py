@@ -0,0 +1,106 @@
+import hashlib
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import get_finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+STATIC_MANIFEST = '.collectstatic.sha256'
+
+
+def migrations_fingerprint(migrations) -> str:
+    digest = hashlib.sha256()
+    for app_label, name in sorted(migrations):
+        digest.update(f'{app_label}.{name}\n'.encode())
+    return digest.hexdigest()[:12]
+
+
+def static_fingerprint() -> str:
+    """Хэш путей и содержимого всех исходников collectstatic."""
+    digest = hashlib.sha256()
+    files = {}
+    for finder in get_finders():
+        for path, storage in finder.list(['CVS', '.*', '*~']):
+            # Как и collectstatic, берем первый найденный файл.
+            files.setdefault(path, storage)
+
+    for path in sorted(files):
+        digest.update(path.encode() + b'\0')
+        with files[path].open(path) as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Command(BaseCommand):
+    help = (
+        'Подготовка контейнера к запуску: migrate и collectstatic '
+        'выполняются, только если миграции или статика изменились.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--skip-static', action='store_true', help='Не собирать статику')
+        parser.add_argument('--force', action='store_true', help='Выполнить оба шага без проверок')
+
+    def handle(self, *args, **options):
+        self.timings = []
+        started = time.perf_counter()
+
+        self.migrate(options['database'], options['force'])
+        if not options['skip_static']:
+            self.collectstatic(options['force'])
+
+        for phase, elapsed in self.timings:
+            self.stdout.write(f'  {phase:<24} {elapsed * 1000:8.1f} ms')
+        self.stdout.write(self.style.SUCCESS(
+            f'Ready in {(time.perf_counter() - started) * 1000:.1f} ms'))
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((name, time.perf_counter() - start))
+
+    def migrate(self, database, force):
+        with self.phase('migrations: check'):
+            executor = MigrationExecutor(connections[database])
+            loader = executor.loader
+            plan = executor.migration_plan(loader.graph.leaf_nodes())
+
+        disk = migrations_fingerprint(loader.disk_migrations)
+        applied = migrations_fingerprint(loader.applied_migrations)
+        if plan or force:
+            self.stdout.write(
+                f'Migrations: {len(plan)} to apply (disk {disk}, applied {applied})')
+            with self.phase('migrations: migrate'):
+                call_command('migrate', database=database, interactive=False, verbosity=1)
+        else:
+            self.stdout.write(f'Migrations up to date ({disk}), skipping migrate')
+
+    def collectstatic(self, force):
+        static_root = getattr(settings, 'STATIC_ROOT', None)
+        if not static_root:
+            self.stdout.write('STATIC_ROOT is not set, skipping collectstatic')
+            return
+
+        manifest = Path(static_root) / STATIC_MANIFEST
+        with self.phase('static: hash'):
+            fingerprint = static_fingerprint()
+
+        previous = manifest.read_text().strip() if manifest.exists() else None
+        if fingerprint == previous and not force:
+            self.stdout.write(f'Static files unchanged ({fingerprint[:12]}), skipping collectstatic')
+            return
+
+        with self.phase('static: collectstatic'):
+            call_command('collectstatic', interactive=False, verbosity=0)
+        manifest.write_text(fingerprint + '\n')
+        self.stdout.write(f'Static files collected ({fingerprint[:12]})')
@@ -0,0 +1,226 @@
+import csv
+import json
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from events_app.models import EventModel, EventTagModel, TagModel
+from events_app.models.tags import parse_tags
+from events_app.utils.cache import invalidate_all_events
+
+# Разделители списка участников в CSV-колонке participants.
+PARTICIPANT_SEPARATORS = str.maketrans({',': ' ', ';': ' '})
+
+
+class EmailLookup:
+    """
+    Кэш email -> id пользователя на время импорта.
+
+    Неизвестные адреса тоже кэшируются (как None), поэтому каждый email
+    ищется в БД не больше одного раза, а поиск идет одним запросом на пачку.
+    """
+
+    def __init__(self):
+        self.ids: dict[str, int | None] = {}
+        self.queries = 0
+
+    def resolve(self, emails) -> None:
+        missing = {email for email in emails if email not in self.ids}
+        if not missing:
+            return
+        self.queries += 1
+        found = dict(get_user_model().objects.filter(email__in=missing).values_list('email', 'id'))
+        for email in missing:
+            self.ids[email] = found.get(email)
+
+    def get(self, email: str) -> int | None:
+        return self.ids.get(email)
+
+
+def read_rows(stream, fmt: str):
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+        return
+
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield {'__error__': f'invalid JSON: {e}'}
+            continue
+        yield row if isinstance(row, dict) else {'__error__': 'not a JSON object'}
+
+
+def parse_participants(value) -> list[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.translate(PARTICIPANT_SEPARATORS).split()
+    return list(dict.fromkeys(str(email).strip() for email in value if str(email).strip()))
+
+
+def parse_time(value):
+    try:
+        parsed = parse_datetime(str(value or '').strip())
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({'time': 'Expected ISO 8601 datetime'})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, timezone.get_default_timezone())
+    return parsed
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоковый импорт событий из CSV или JSONL (файл или stdin). '
+        'Колонки: title, time, location, description, tags, organizer (email), '
+        'participants (emails), max_participants.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-', help='Файл или "-" для stdin')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='По умолчанию - по расширению файла')
+        parser.add_argument('--batch-size', type=int, default=500, help='Строк в одной транзакции')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or self.detect_format(options['path'])
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive')
+
+        self.lookup = EmailLookup()
+        self.stats = {'rows': 0, 'imported': 0, 'skipped': 0, 'participants': 0, 'unknown_emails': 0}
+        self.line = 0
+
+        start = time.perf_counter()
+        with self.open(options['path']) as stream:
+            rows = read_rows(stream, fmt)
+            while chunk := list(islice(rows, batch_size)):
+                self.import_chunk(chunk)
+        elapsed = time.perf_counter() - start
+
+        if self.stats['imported']:
+            # bulk_create не шлет post_save: сбрасываем кэш событий целиком.
+            invalidate_all_events()
+
+        self.stats['user_lookup_queries'] = self.lookup.queries
+        self.stats['elapsed_s'] = round(elapsed, 3)
+        self.stats['rows_per_s'] = round(self.stats['rows'] / elapsed, 1) if elapsed else 0.0
+        self.stdout.write(json.dumps(self.stats))
+
+    @staticmethod
+    def detect_format(path: str) -> str:
+        suffix = Path(path).suffix.lower()
+        if suffix == '.csv':
+            return 'csv'
+        if suffix in ('.jsonl', '.ndjson', '.json') or path == '-':
+            return 'jsonl'
+        raise CommandError(f'Cannot detect format of {path}, pass --format')
+
+    @staticmethod
+    def open(path: str):
+        if path == '-':
+            # Обертка не должна закрывать сам stdin.
+            return open(sys.stdin.fileno(), encoding='utf-8', newline='', closefd=False)
+        try:
+            return open(path, encoding='utf-8', newline='')
+        except OSError as e:
+            raise CommandError(e)
+
+    def import_chunk(self, chunk: list[dict]) -> None:
+        emails = set()
+        for row in chunk:
+            emails.add(str(row.get('organizer') or '').strip())
+            emails.update(parse_participants(row.get('participants')))
+        emails.discard('')
+        self.lookup.resolve(emails)
+
+        events, participants, tag_names = [], [], []
+        for row in chunk:
+            self.line += 1
+            self.stats['rows'] += 1
+            try:
+                event, user_ids = self.build_event(row)
+            except ValidationError as e:
+                self.stats['skipped'] += 1
+                self.stderr.write(f'Row {self.line}: skipped, {self.format_error(e)}')
+                continue
+            events.append(event)
+            participants.append(user_ids)
+            tag_names.append(parse_tags(event.tags))
+
+        if not events:
+            return
+
+        with transaction.atomic():
+            EventModel.objects.bulk_create(events)
+
+            through = EventModel.joined_users.through
+            through.objects.bulk_create(
+                through(eventmodel_id=event.pk, customuser_id=user_id)
+                for event, user_ids in zip(events, participants)
+                for user_id in user_ids
+            )
+
+            tags = {tag.name: tag.pk for tag in TagModel.resolve(
+                list(dict.fromkeys(name for names in tag_names for name in names)))}
+            EventTagModel.objects.bulk_create(
+                EventTagModel(event_id=event.pk, tag_id=tags[name])
+                for event, names in zip(events, tag_names)
+                for name in names
+            )
+
+        self.stats['imported'] += len(events)
+        self.stats['participants'] += sum(len(user_ids) for user_ids in participants)
+
+    def build_event(self, row: dict):
+        if '__error__' in row:
+            raise ValidationError(row['__error__'])
+
+        user_ids = []
+        for email in parse_participants(row.get('participants')):
+            user_id = self.lookup.get(email)
+            if user_id is None:
+                self.stats['unknown_emails'] += 1
+            elif user_id not in user_ids:
+                user_ids.append(user_id)
+
+        organizer = str(row.get('organizer') or '').strip()
+        organizer_id = self.lookup.get(organizer) if organizer else None
+        if organizer and organizer_id is None:
+            self.stats['unknown_emails'] += 1
+
+        max_participants = row.get('max_participants')
+        event = EventModel(
+            title=str(row.get('title') or '').strip(),
+            time=parse_time(row.get('time')),
+            location=str(row.get('location') or '').strip(),
+            description=str(row.get('description') or '').strip(),
+            tags=str(row.get('tags') or '').strip(),
+            organizer_id=organizer_id,
+            max_participants=max_participants if max_participants not in (None, '') else None,
+            participants_count=len(user_ids),
+        )
+        # Те же ограничения, что и у API; FK уже проверены через lookup.
+        event.clean_fields(exclude=['organizer', 'search_vector'])
+        if event.max_participants is not None and len(user_ids) > event.max_participants:
+            raise ValidationError({'participants': 'More participants than max_participants'})
+        return event, user_ids
+
+    @staticmethod
+    def format_error(error: ValidationError) -> str:
+        if hasattr(error, 'message_dict'):
+            return '; '.join(f'{field}: {" ".join(messages)}' for field, messages in error.message_dict.items())
+        return ' '.join(error.messages)
@@ -1,19 +1,54 @@
+import random
 import time
-from psycopg import OperationalError as PsycopgError
-from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, DatabaseError
+
+from djangoProject.db import probe_database
+
 
 class Command(BaseCommand):
+    help = 'Ждет, пока база данных начнет отвечать на SELECT 1.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--timeout', type=float, default=60.0, help='Сколько ждать всего, секунд')
+        parser.add_argument('--initial-delay', type=float, default=0.05, help='Первая пауза, секунд')
+        parser.add_argument('--max-delay', type=float, default=2.0, help='Предельная пауза, секунд')
+
     def handle(self, *args, **options):
         self.stdout.write('Waiting for database...')
-        db_up = False
+        started = time.monotonic()
+        deadline = started + options['timeout']
+        delay = options['initial_delay']
+        attempt = 0
 
-        while db_up is False:
+        while True:
+            attempt += 1
+            attempt_start = time.monotonic()
             try:
-                self.check(databases=['default'])
-                db_up = True
-            except (PsycopgError, OperationalError):
-                self.stdout.write('Database unavailable, waiting 1 second...')
-                time.sleep(1)
+                probe_database(options['database'], timeout=deadline - attempt_start)
+                error = None
+            except DatabaseError as e:
+                error = str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+            latency = (time.monotonic() - attempt_start) * 1000
+            if error is None:
+                break
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise CommandError(
+                    f'Database unavailable after {attempt} attempts '
+                    f'({options["timeout"]:g} s): {error}')
+
+            # Джиттер разводит по времени контейнеры, стартующие одновременно.
+            sleep = min(random.uniform(delay / 2, delay), remaining)
+            self.stdout.write(
+                f'Attempt {attempt}: unavailable ({latency:.1f} ms, {error}), '
+                f'retrying in {sleep * 1000:.0f} ms')
+            time.sleep(sleep)
+            delay = min(delay * 2, options['max_delay'])
 
-        self.stdout.write(self.style.SUCCESS('Database available!'))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS(
+            f'Database available! Attempt {attempt}: {latency:.1f} ms, '
+            f'total {(time.monotonic() - started) * 1000:.1f} ms'))
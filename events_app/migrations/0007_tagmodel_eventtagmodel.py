@@ -0,0 +1,46 @@
+# Generated by Django 6.1.2 on 2026-10-17 02:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events_app', '0006_eventmodel_organizer_alter_eventmodel_joined_users'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Тег',
+                'verbose_name_plural': 'Теги',
+            },
+        ),
+        migrations.CreateModel(
+            name='EventTagModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='events_app.eventmodel')),
+                ('tag', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='events_app.tagmodel')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='eventmodel',
+            name='tag_items',
+            field=models.ManyToManyField(blank=True, related_name='events', through='events_app.EventTagModel', to='events_app.tagmodel'),
+        ),
+        migrations.AddIndex(
+            model_name='eventtagmodel',
+            index=models.Index(fields=['tag', 'event'], name='event_tag_tag_event_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='eventtagmodel',
+            constraint=models.UniqueConstraint(fields=('event', 'tag'), name='event_tag_unique'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+import re
+
+from django.db import migrations
+
+BATCH_SIZE = 500
+TAG_SEPARATORS = re.compile(r'[,;#]')
+
+
+def split_tags(value):
+    names = []
+    for part in TAG_SEPARATORS.split(value or ''):
+        name = part.strip().lower()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def fill_event_tags(apps, schema_editor):
+    EventModel = apps.get_model('events_app', 'EventModel')
+    TagModel = apps.get_model('events_app', 'TagModel')
+    EventTagModel = apps.get_model('events_app', 'EventTagModel')
+
+    tag_ids = {}
+
+    def flush(batch):
+        names = {name for _, event_names in batch for name in event_names}
+        missing = names - tag_ids.keys()
+        if missing:
+            TagModel.objects.bulk_create(
+                [TagModel(name=name) for name in missing],
+                ignore_conflicts=True,
+            )
+            tag_ids.update(
+                TagModel.objects.filter(name__in=missing).values_list('name', 'id')
+            )
+        EventTagModel.objects.bulk_create(
+            [
+                EventTagModel(event_id=event_id, tag_id=tag_ids[name])
+                for event_id, event_names in batch
+                for name in event_names
+            ],
+            ignore_conflicts=True,
+        )
+
+    batch = []
+    events = EventModel.objects.values_list('id', 'tags').order_by('id')
+    for event_id, tags in events.iterator(chunk_size=BATCH_SIZE):
+        names = split_tags(tags)
+        if names:
+            batch.append((event_id, names))
+        if len(batch) >= BATCH_SIZE:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events_app', '0007_tagmodel_eventtagmodel'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_event_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,124 @@
+from datetime import datetime
+
+from django.db import migrations, models
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+BATCH_SIZE = 500
+
+# Форматы, в которых время вводилось, пока поле было строкой.
+LEGACY_FORMATS = (
+    '%d.%m.%Y %H:%M',
+    '%d.%m.%Y, %H:%M',
+    '%d.%m.%Y в %H:%M',
+    '%H:%M %d.%m.%Y',
+    '%d.%m.%Y',
+    '%d/%m/%Y %H:%M',
+    '%d/%m/%Y',
+)
+
+
+def parse_legacy_time(value):
+    value = (value or '').strip()
+    if not value:
+        return None
+
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        parsed = None
+
+    if parsed is None:
+        for fmt in LEGACY_FORMATS:
+            try:
+                parsed = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+
+    if parsed is None:
+        return None
+    if timezone.is_naive(parsed):
+        # Строки вводились по местному времени (settings.TIME_ZONE).
+        parsed = timezone.make_aware(parsed, timezone.get_default_timezone())
+    return parsed
+
+
+def convert_legacy_time(apps, schema_editor):
+    EventModel = apps.get_model('events_app', 'EventModel')
+
+    batch = []
+    events = EventModel.objects.values_list('id', 'time').order_by('id')
+    for event_id, value in events.iterator(chunk_size=BATCH_SIZE):
+        parsed = parse_legacy_time(value)
+        if parsed is not None:
+            batch.append(EventModel(id=event_id, time_parsed=parsed))
+        elif (value or '').strip():
+            # Нераспознанный текст не теряем: остается в time_legacy.
+            batch.append(EventModel(id=event_id, time_legacy=value))
+        if len(batch) >= BATCH_SIZE:
+            EventModel.objects.bulk_update(batch, ['time_parsed', 'time_legacy'])
+            batch = []
+    if batch:
+        EventModel.objects.bulk_update(batch, ['time_parsed', 'time_legacy'])
+
+
+def restore_legacy_time(apps, schema_editor):
+    EventModel = apps.get_model('events_app', 'EventModel')
+    default_tz = timezone.get_default_timezone()
+
+    batch = []
+    events = EventModel.objects.exclude(time_parsed=None, time_legacy='').values_list(
+        'id', 'time_parsed', 'time_legacy')
+    for event_id, value, legacy in events.order_by('id').iterator(chunk_size=BATCH_SIZE):
+        if value is None:
+            batch.append(EventModel(id=event_id, time=legacy))
+        else:
+            local = timezone.localtime(value, default_tz)
+            batch.append(EventModel(id=event_id, time=local.strftime('%d.%m.%Y %H:%M')))
+        if len(batch) >= BATCH_SIZE:
+            EventModel.objects.bulk_update(batch, ['time'])
+            batch = []
+    if batch:
+        EventModel.objects.bulk_update(batch, ['time'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events_app', '0008_split_event_tags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventmodel',
+            name='time_parsed',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='eventmodel',
+            name='time_legacy',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(convert_legacy_time, restore_legacy_time),
+        # default нужен только для отката: RemoveField вернет колонку NOT NULL.
+        migrations.AlterField(
+            model_name='eventmodel',
+            name='time',
+            field=models.CharField(default='', max_length=255),
+        ),
+        migrations.RemoveField(
+            model_name='eventmodel',
+            name='time',
+        ),
+        migrations.RenameField(
+            model_name='eventmodel',
+            old_name='time_parsed',
+            new_name='time',
+        ),
+        migrations.AlterField(
+            model_name='eventmodel',
+            name='time',
+            field=models.DateTimeField(db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 6.1.2 on 2026-10-17 02:03
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from events_app.utils.search import install_search_backend, uninstall_search_backend
+
+
+def install(apps, schema_editor):
+    install_search_backend(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_search_backend(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events_app', '0009_eventmodel_time_datetime'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventmodel',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(install, uninstall),
+    ]
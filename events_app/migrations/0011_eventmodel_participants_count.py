@@ -0,0 +1,30 @@
+# Generated by Django 6.1.2 on 2026-10-17 02:14
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_participants_count(apps, schema_editor):
+    EventModel = apps.get_model('events_app', 'EventModel')
+    through = EventModel.joined_users.through
+
+    counts = through.objects.filter(eventmodel_id=OuterRef('pk')).order_by().values(
+        'eventmodel_id').annotate(count=Count('*')).values('count')
+    EventModel.objects.update(participants_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events_app', '0010_eventmodel_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventmodel',
+            name='participants_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_participants_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.1.2 on 2026-10-17 02:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events_app', '0011_eventmodel_participants_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventmodel',
+            name='max_participants',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='eventmodel',
+            name='waitlist_enabled',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='WaitlistEntryModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('event', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='events_app.eventmodel')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Лист ожидания',
+                'verbose_name_plural': 'Лист ожидания',
+                'constraints': [models.UniqueConstraint(fields=('event', 'user'), name='waitlist_event_user_unique')],
+            },
+        ),
+    ]
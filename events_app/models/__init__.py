@@ -1,7 +1,12 @@
 from .events import EventModel
+from .tags import EventTagModel, TagModel
 from .users import CustomUser
+from .waitlist import WaitlistEntryModel
 
 __all__ = [
     "EventModel",
+    "EventTagModel",
+    "TagModel",
     "CustomUser",
-]
\ No newline at end of file
+    "WaitlistEntryModel",
+]
@@ -1,11 +1,39 @@
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from events_app.models.tags import TagModel, parse_tags
+
+# Результаты EventModel.join/leave.
+JOINED = 'joined'
+ALREADY_JOINED = 'already_joined'
+WAITLISTED = 'waitlisted'
+FULL = 'full'
+LEFT = 'left'
+LEFT_WAITLIST = 'left_waitlist'
+NOT_JOINED = 'not_joined'
+
+
+class NoSeatError(Exception):
+    """Мест нет: откатывает вставку участника в EventModel.join."""
+
 
 class EventModel(models.Model):
     title = models.CharField(max_length=255)
-    time = models.CharField(max_length=255)
+    time = models.DateTimeField(null=True, db_index=True)
+    # Исходная строка времени, которую миграция 0009 не смогла разобрать;
+    # у остальных событий пустая.
+    time_legacy = models.CharField(max_length=255, blank=True, default='', editable=False)
     location = models.CharField(max_length=255)
     description = models.TextField()
     tags = models.CharField(max_length=255)
+    tag_items = models.ManyToManyField(
+        "events_app.TagModel",
+        through="events_app.EventTagModel",
+        blank=True,
+        related_name="events"
+    )
     joined_users = models.ManyToManyField(
         "events_app.CustomUser",
         blank=True,
@@ -16,10 +44,162 @@ class EventModel(models.Model):
         on_delete=models.SET_NULL,
         null=True, blank=True, related_name="organizer"
     )
+    # Денормализованное число joined_users: обновляется через F() в
+    # join/leave и пересчитывается сигналом при прочих изменениях связи.
+    participants_count = models.PositiveIntegerField(default=0, editable=False)
+    # None - без ограничения. Проверяется условным UPDATE в join.
+    max_participants = models.PositiveIntegerField(null=True, blank=True)
+    waitlist_enabled = models.BooleanField(default=False)
+    # Заполняется триггером PostgreSQL (см. events_app.utils.search);
+    # на SQLite вместо него работает FTS5-таблица.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_tags = instance.__dict__.get('tags')
+        instance._loaded_max_participants = instance.__dict__.get('max_participants')
+        return instance
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+
+        # Лимит подняли - свободные места сразу отдаем листу ожидания.
+        if self._capacity_raised(kwargs.get('update_fields')):
+            self.promote_waitlisted()
+
+        # tags остается исходной строкой для API, а tag_items - ее
+        # нормализованная копия для поиска; пересобираем только при изменении.
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'tags' not in update_fields:
+            return
+        if 'tags' in self.get_deferred_fields():
+            return
+        if self.tags == getattr(self, '_loaded_tags', None):
+            return
+        names = parse_tags(self.tags)
+        if adding and not names:
+            # У нового события связей еще нет: set([]) - лишние запросы.
+            self._loaded_tags = self.tags
+            return
+        self.sync_tags(names)
+
+    def sync_tags(self, names: list[str] | None = None):
+        if names is None:
+            names = parse_tags(self.tags)
+        self.tag_items.set(TagModel.resolve(names))
+        self._loaded_tags = self.tags
+
+    def _capacity_raised(self, update_fields) -> bool:
+        if update_fields is not None and 'max_participants' not in update_fields:
+            return False
+        if 'max_participants' in self.get_deferred_fields():
+            return False
+        loaded = getattr(self, '_loaded_max_participants', None)
+        self._loaded_max_participants = self.max_participants
+        return loaded is not None and (self.max_participants is None or self.max_participants > loaded)
+
+    def join(self, user) -> str:
+        """
+        Добавляет участника одной вставкой в through-таблицу.
+
+        Повторная запись отсекается уникальным индексом, а место
+        занимается условным UPDATE (participants_count < max_participants),
+        который блокирует строку события: параллельные join не теряют друг
+        друга и не превышают лимит. Если мест нет, вставка откатывается и
+        пользователь попадает в лист ожидания (при waitlist_enabled).
+        m2m_changed не отправляется - кэш сбрасывает вызывающий код.
+        """
+        through = type(self).joined_users.through
+        try:
+            with transaction.atomic():
+                through.objects.create(eventmodel_id=self.pk, customuser_id=user.pk)
+                if not self._take_seat():
+                    raise NoSeatError
+        except IntegrityError:
+            return ALREADY_JOINED
+        except NoSeatError:
+            return self._enqueue(user)
+        return JOINED
+
+    def leave(self, user) -> str:
+        """Удаляет участника одним DELETE и отдает место первому из листа ожидания."""
+        through = type(self).joined_users.through
+        with transaction.atomic():
+            deleted, _ = through.objects.filter(
+                eventmodel_id=self.pk, customuser_id=user.pk).delete()
+            if not deleted:
+                deleted, _ = self.waitlist.filter(user_id=user.pk).delete()
+                self._refresh_participants()
+                return LEFT_WAITLIST if deleted else NOT_JOINED
+
+            self._shift_participants(-1)
+            self.promote_waitlisted()
+        return LEFT
+
+    def promote_waitlisted(self) -> list[int]:
+        """Переводит ожидающих в участники, пока есть места; возвращает их id."""
+        through = type(self).joined_users.through
+        promoted = []
+        with transaction.atomic():
+            while True:
+                # skip_locked: параллельный leave заберет следующую запись.
+                entry = self.waitlist.select_for_update(skip_locked=True).order_by('id').first()
+                if entry is None:
+                    break
+                try:
+                    with transaction.atomic():
+                        entry.delete()
+                        through.objects.create(eventmodel_id=self.pk, customuser_id=entry.user_id)
+                        if not self._take_seat():
+                            raise NoSeatError
+                except IntegrityError:
+                    # Уже участвует (добавлен в обход join): просто убираем из очереди.
+                    type(entry).objects.filter(pk=entry.pk).delete()
+                    continue
+                except NoSeatError:
+                    break
+                promoted.append(entry.user_id)
+        return promoted
+
+    def _enqueue(self, user) -> str:
+        self._refresh_participants()
+        if not self.waitlist_enabled:
+            return FULL
+        self.waitlist.get_or_create(user_id=user.pk)
+        return WAITLISTED
+
+    def _take_seat(self) -> bool:
+        has_seat = Q(max_participants__isnull=True) | Q(participants_count__lt=F('max_participants'))
+        taken = type(self).objects.filter(pk=self.pk).filter(has_seat).update(
+            participants_count=F('participants_count') + 1)
+        if taken:
+            self._refresh_participants()
+        return bool(taken)
+
+    def _shift_participants(self, delta: int) -> None:
+        type(self).objects.filter(pk=self.pk).update(
+            participants_count=F('participants_count') + delta)
+        self._refresh_participants()
+
+    def _refresh_participants(self) -> None:
+        self.participants_count = type(self).objects.filter(pk=self.pk).values_list(
+            'participants_count', flat=True).get()
+
+    @classmethod
+    def recount_participants(cls, queryset=None) -> None:
+        """Пересчитывает participants_count одним UPDATE по through-таблице."""
+        through = cls.joined_users.through
+        counts = through.objects.filter(eventmodel_id=OuterRef('pk')).order_by().values(
+            'eventmodel_id').annotate(count=Count('*')).values('count')
+        if queryset is None:
+            queryset = cls.objects.all()
+        queryset.update(participants_count=Coalesce(Subquery(counts), Value(0)))
+
     class Meta:
         verbose_name = 'События'
-        verbose_name_plural = 'События'
\ No newline at end of file
+        verbose_name_plural = 'События'
@@ -0,0 +1,75 @@
+import re
+
+from django.db import models
+
+TAG_SEPARATORS = re.compile(r'[,;#]')
+
+
+def parse_tags(value: str | None) -> list[str]:
+    """
+    Разбивает строку тегов на нормализованные имена.
+
+    Разделители - запятая, точка с запятой и '#'. Имена приводятся
+    к нижнему регистру, пустые и повторяющиеся отбрасываются, порядок
+    сохраняется.
+    """
+    if not value:
+        return []
+
+    names = []
+    for part in TAG_SEPARATORS.split(value):
+        name = part.strip().lower()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+class TagModel(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def resolve(cls, names: list[str]) -> list['TagModel']:
+        """Возвращает теги по именам, создавая недостающие одним запросом."""
+        if not names:
+            return []
+
+        existing = {tag.name: tag for tag in cls.objects.filter(name__in=names)}
+        missing = [cls(name=name) for name in names if name not in existing]
+        if missing:
+            cls.objects.bulk_create(missing, ignore_conflicts=True)
+            existing = {tag.name: tag for tag in cls.objects.filter(name__in=names)}
+
+        return [existing[name] for name in names]
+
+    class Meta:
+        verbose_name = 'Тег'
+        verbose_name_plural = 'Теги'
+
+
+class EventTagModel(models.Model):
+    # Отдельные индексы по FK не нужны: event_id покрывает уникальный
+    # индекс (event, tag), tag_id - индекс (tag, event) для фильтрации.
+    event = models.ForeignKey(
+        "events_app.EventModel",
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+    tag = models.ForeignKey(
+        TagModel,
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event', 'tag'],
+                name='event_tag_unique',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['tag', 'event'], name='event_tag_tag_event_idx'),
+        ]
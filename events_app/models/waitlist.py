@@ -0,0 +1,28 @@
+from django.db import models
+
+
+class WaitlistEntryModel(models.Model):
+    # Индекс event_id покрывает уникальный индекс (event, user); очередь
+    # разбирается по id, то есть в порядке записи.
+    event = models.ForeignKey(
+        "events_app.EventModel",
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name="waitlist",
+    )
+    user = models.ForeignKey(
+        "events_app.CustomUser",
+        on_delete=models.CASCADE,
+        related_name="waitlist_entries",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Лист ожидания'
+        verbose_name_plural = 'Лист ожидания'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event', 'user'],
+                name='waitlist_event_user_unique',
+            ),
+        ]
@@ -0,0 +1,90 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from events_app.models.events import EventModel
+from events_app.utils.authentication import user_cache, user_cache_key
+from events_app.utils.cache import invalidate_all_events, invalidate_events
+
+
+@receiver(post_save, sender=EventModel)
+@receiver(post_delete, sender=EventModel)
+def invalidate_event_cache(sender, instance, **kwargs):
+    invalidate_events(instance.pk)
+
+
+@receiver(m2m_changed, sender=EventModel.joined_users.through)
+def invalidate_event_participants_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        invalidate_events(instance.pk)
+    elif pk_set:
+        # Изменили события пользователя: user.joined_users.add(...)
+        invalidate_events(*pk_set)
+    else:
+        # clear() с обратной стороны не сообщает, какие события затронуты.
+        invalidate_all_events()
+
+
+@receiver(m2m_changed, sender=EventModel.joined_users.through)
+def recount_event_participants(sender, instance, action, reverse, pk_set, **kwargs):
+    # join/leave ведут счетчик сами; здесь - set()/add()/remove() через
+    # сериализатор или админку.
+    if reverse and action == 'pre_clear':
+        instance._cleared_event_ids = list(instance.joined_users.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        EventModel.recount_participants(EventModel.objects.filter(pk=instance.pk))
+        instance.refresh_from_db(fields=['participants_count'])
+        return
+
+    event_ids = pk_set if action != 'post_clear' else instance.__dict__.pop('_cleared_event_ids', ())
+    if event_ids:
+        EventModel.recount_participants(EventModel.objects.filter(pk__in=event_ids))
+
+
+@receiver(pre_delete, sender=get_user_model())
+def remember_joined_events(sender, instance, **kwargs):
+    # Каскадное удаление строк through-таблицы не шлет m2m_changed.
+    instance._joined_event_ids = list(instance.joined_users.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=get_user_model())
+def recount_joined_events(sender, instance, **kwargs):
+    event_ids = instance.__dict__.pop('_joined_event_ids', ())
+    if event_ids:
+        EventModel.recount_participants(EventModel.objects.filter(pk__in=event_ids))
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_user_cache(sender, instance, created=False, update_fields=None, **kwargs):
+    # Новый пользователь еще не встречается ни в одном событии, а
+    # служебные обновления (например, last_login) не попадают в ответ.
+    if created:
+        return
+
+    from events_app.api.serializers.events import get_user_output_fields
+    if update_fields is not None and not set(update_fields) & set(get_user_output_fields()):
+        return
+
+    invalidate_all_events()
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_authenticated_user(sender, instance, using=None, **kwargs):
+    # Любое сохранение, в том числе смена is_active или пароля. Второй
+    # раз - после коммита: параллельный запрос мог успеть закэшировать
+    # строку, которую транзакция еще не зафиксировала.
+    key = user_cache_key(instance.pk)
+    user_cache.pop(key)
+    transaction.on_commit(partial(user_cache.pop, key), using=using)
@@ -1,3 +1,618 @@
-from django.test import TestCase
+import base64
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.test import AsyncRequestFactory, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from events_app.api.views.events import AsyncEventDetailView, AsyncEventListView
+from events_app.api.views.users import AsyncTokenObtainView
+from events_app.models.events import FULL, JOINED, EventModel
+from events_app.utils.authentication import user_cache, user_cache_key
+from events_app.utils.cache import get_cache
+
+
+def make_user(name, **extra):
+    # Без пароля: PBKDF2 заметно тормозит тесты.
+    return get_user_model().objects.create_user(
+        username=name, email=f'{name}@example.com', password=extra.pop('password', None), **extra)
+
+
+def make_event(**extra):
+    fields = {
+        'title': 'Event', 'time': '2030-01-01T10:00:00Z', 'location': 'Hall',
+        'description': 'About', 'tags': 'x',
+    }
+    return EventModel.objects.create(**{**fields, **extra})
+
+
+class EventsAPITestCase(APITestCase):
+    """Кэш событий и пользователей живет в процессе: чистим между тестами."""
+
+    def setUp(self):
+        get_cache().clear()
+        user_cache.clear()
+
+    def event_ids(self, url='/api/events/', **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [event['id'] for event in response.json()['results']]
+
+
+class ConcurrentJoinTests(TransactionTestCase):
+    def test_concurrent_joins_do_not_exceed_capacity(self):
+        users = [make_user(f'user{i}') for i in range(8)]
+        event = make_event(max_participants=3)
+
+        barrier = threading.Barrier(len(users))
+        results = []
+
+        def join(user):
+            barrier.wait()
+            try:
+                for _ in range(200):
+                    try:
+                        results.append(EventModel.objects.get(pk=event.pk).join(user))
+                        return
+                    except OperationalError:
+                        # SQLite в памяти не ждет чужую блокировку, а сразу
+                        # отвечает "table is locked"; join атомарен, повтор безопасен.
+                        time.sleep(0.01)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=join, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        event.refresh_from_db()
+        self.assertEqual(results.count(JOINED), 3)
+        self.assertEqual(results.count(FULL), len(users) - 3)
+        self.assertEqual(event.participants_count, 3)
+        self.assertEqual(event.joined_users.count(), 3)
+
+
+class EventCapacityTests(EventsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.users = [make_user(f'user{i}') for i in range(3)]
+        self.event = make_event(max_participants=1)
+
+    def test_update_accepts_joined_users_within_capacity(self):
+        response = self.client.patch(
+            f'/api/events/{self.event.pk}/', {'joined_users': [self.users[0].pk]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['participants_count'], 1)
+
+    def test_update_rejects_joined_users_over_capacity(self):
+        response = self.client.patch(
+            f'/api/events/{self.event.pk}/',
+            {'joined_users': [self.users[0].pk, self.users[1].pk]}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('joined_users', response.json())
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participants_count, 0)
+
+    def test_update_rejects_capacity_below_participants(self):
+        self.event.max_participants = 2
+        self.event.save()
+        self.event.joined_users.set(self.users[:2])
+
+        response = self.client.patch(
+            f'/api/events/{self.event.pk}/', {'max_participants': 1}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('max_participants', response.json())
+
+    def test_create_counts_organizer(self):
+        self.client.force_authenticate(self.users[0])
+        response = self.client.post('/api/events/', {
+            'title': 'Event', 'time': '2030-01-01T10:00:00Z', 'location': 'Hall',
+            'description': 'About', 'tags': 'x', 'max_participants': 1,
+            'joined_users': [self.users[1].pk],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(EventModel.objects.filter(organizer=self.users[0]).exists())
+
+
+class EventUpdateResponseTests(EventsAPITestCase):
+    def test_update_returns_fresh_participants(self):
+        users = [make_user(f'user{i}') for i in range(2)]
+        event = make_event()
+        event.joined_users.set(users[:1])
+
+        response = self.client.patch(
+            f'/api/events/{event.pk}/', {'joined_users': [user.pk for user in users]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['participants'], [user.pk for user in users])
+        self.assertEqual(response.json()['participants_count'], 2)
+
+
+@override_settings(MONITORING_TOKEN='monitoring-secret')
+class MetricsAccessTests(EventsAPITestCase):
+    def test_anonymous_is_rejected(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+
+    def test_regular_user_is_forbidden(self):
+        self.client.force_authenticate(make_user('user'))
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+    def test_monitoring_token_and_staff_see_metrics(self):
+        self.client.get('/api/events/')
+
+        response = self.client.get('/metrics', headers={'Authorization': 'Bearer monitoring-secret'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'http_requests_total{method="GET",route="event-list"', response.content)
+
+        self.client.force_authenticate(make_user('admin', is_staff=True))
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+
+    def test_concurrent_sync_does_not_double_count(self):
+        from events_app.utils import metrics
+        from events_app.utils.cache import cache_stats
+
+        metrics.sync_process_stats(force=True)
+        hits = metrics.CACHE_REQUESTS.labels('hit')
+        before = hits._value.get()
+        for _ in range(3):
+            cache_stats.hit()
+
+        inc = hits.inc
+
+        def slow_inc(amount=1):
+            # Расширяет окно между чтением _totals и записью в set_total.
+            time.sleep(0.05)
+            inc(amount)
+
+        threads = [threading.Thread(target=metrics.sync_process_stats, args=(True,)) for _ in range(4)]
+        with mock.patch.object(hits, 'inc', slow_inc):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(hits._value.get() - before, 3)
+
+class EventPaginationTests(EventsAPITestCase):
+    def test_cursor_pages_cover_all_events(self):
+        events = [make_event() for _ in range(5)]
+
+        body = self.client.get('/api/events/', {'page_size': 2}).json()
+        self.assertNotIn('count', body)
+        ids = [event['id'] for event in body['results']]
+        pages = 1
+        while body['next']:
+            body = self.client.get(body['next']).json()
+            ids += [event['id'] for event in body['results']]
+            pages += 1
+
+        self.assertEqual(ids, [event.pk for event in events])
+        self.assertEqual(pages, 3)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/events/', {'cursor': 'bogus'}).status_code, 404)
+
+
+class TagFilterTests(EventsAPITestCase):
+    def test_tags_any_and_all(self):
+        python = make_event(tags='Python, django')
+        go = make_event(tags='go')
+        both = make_event(tags='python; go')
+
+        self.assertEqual(self.event_ids(tags='python,go'), [python.pk, go.pk, both.pk])
+        self.assertEqual(self.event_ids(tags='python,go', tags_mode='all'), [both.pk])
+        self.assertEqual(self.event_ids(tags='DJANGO'), [python.pk])
+        self.assertEqual(
+            self.client.get('/api/events/', {'tags': 'go', 'tags_mode': 'some'}).status_code, 400)
+
+    def test_retagging_updates_filter(self):
+        event = make_event(tags='python')
+        event.tags = 'go'
+        event.save()
+
+        self.assertEqual(self.event_ids(tags='python'), [])
+        self.assertEqual(self.event_ids(tags='go'), [event.pk])
+
+
+class TimeFilterTests(EventsAPITestCase):
+    def test_time_range(self):
+        january = make_event(time='2030-01-01T10:00:00Z')
+        february = make_event(time='2030-02-01T10:00:00Z')
+        march = make_event(time='2030-03-01T10:00:00Z')
+
+        self.assertEqual(self.event_ids(**{'from': '2030-01-15'}), [february.pk, march.pk])
+        self.assertEqual(self.event_ids(to='2030-02-01T10:00:00Z'), [january.pk, february.pk])
+        self.assertEqual(self.event_ids(**{'from': '2030-02-01', 'to': '2030-02-28'}), [february.pk])
+        self.assertEqual(self.client.get('/api/events/', {'from': 'yesterday'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/events/', {'to': '2030-02-30'}).status_code, 400)
+
+    def test_date_only_to_includes_whole_day(self):
+        morning = make_event(time='2030-01-01T10:00:00Z')
+        # Полночь 2 января по TIME_ZONE - уже следующий день.
+        next_day = make_event(time=timezone.make_aware(datetime(2030, 1, 2)))
+
+        self.assertEqual(self.event_ids(to='2030-01-01'), [morning.pk])
+        self.assertEqual(self.event_ids(to='2030-01-02'), [morning.pk, next_day.pk])
+
+    def test_upcoming(self):
+        make_event(time=timezone.now() - timedelta(days=1))
+        upcoming = make_event(time=timezone.now() + timedelta(days=1))
+
+        self.assertEqual(self.event_ids(upcoming='1'), [upcoming.pk])
+
+
+class SearchTests(EventsAPITestCase):
+    def test_search_ranks_title_matches_first(self):
+        in_description = make_event(title='Chess club', description='Python after the games')
+        in_title = make_event(title='Python meetup', description='Talks')
+        make_event(title='Go meetup', description='Talks')
+
+        self.assertEqual(self.event_ids(q='python'), [in_title.pk, in_description.pk])
+        self.assertEqual(self.event_ids(q='rust'), [])
+
+    def test_search_sees_updated_text(self):
+        event = make_event(title='Chess club')
+        event.title = 'Rust club'
+        event.save()
+
+        self.assertEqual(self.event_ids(q='rust'), [event.pk])
+        self.assertEqual(self.event_ids(q='chess'), [])
+
+
+class EventCacheTests(EventsAPITestCase):
+    def test_list_is_cached_until_an_event_changes(self):
+        event = make_event(title='Old')
+        self.assertEqual(self.client.get('/api/events/')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/events/')['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/events/{event.pk}/', {'title': 'New'}, format='json')
+
+        response = self.client.get('/api/events/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['title'], 'New')
+
+    def test_join_invalidates_detail(self):
+        event = make_event()
+        url = f'/api/events/{event.pk}/'
+        self.client.get(url)
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        self.client.force_authenticate(make_user('user'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'{url}join/')
+
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['participants_count'], 1)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class AuthAPITestCase(EventsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = make_user('user', password='secret-pass', first_name='Old')
+
+    def bearer(self):
+        return f'Bearer {AccessToken.for_user(self.user)}'
+
+    def basic(self, password='secret-pass'):
+        return 'Basic ' + base64.b64encode(f'{self.user.email}:{password}'.encode()).decode()
+
+    def me(self, header=None):
+        headers = {'Authorization': header} if header else {}
+        return self.client.get('/api/users/me/', headers=headers)
+
+
+class UserCacheTests(AuthAPITestCase):
+    def test_cached_user_is_dropped_on_save(self):
+        header = self.bearer()
+        self.me(header)
+        self.assertIsNotNone(user_cache.get(user_cache_key(self.user.pk)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = 'New'
+            self.user.save()
+
+        self.assertIsNone(user_cache.get(user_cache_key(self.user.pk)))
+        self.assertEqual(self.me(header).json()['first_name'], 'New')
+
+    def test_deactivated_user_is_rejected(self):
+        header = self.bearer()
+        self.me(header)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        self.assertEqual(self.me(header).status_code, 401)
+
+
+class AuthenticationSchemeTests(AuthAPITestCase):
+    def test_bearer_basic_and_session(self):
+        for header in (self.bearer(), self.basic()):
+            with self.subTest(scheme=header.split()[0]):
+                response = self.me(header)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()['id'], self.user.pk)
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.me().json()['id'], self.user.pk)
+
+    def test_rejected_credentials(self):
+        self.assertEqual(self.me().status_code, 401)
+        self.assertEqual(self.me('Bearer broken').json()['error'], 'access_not_valid')
+        self.assertEqual(self.me(self.basic('wrong')).status_code, 401)
+        self.assertEqual(self.me('Digest whatever').status_code, 401)
+
+    def test_basic_disabled_for_prefix(self):
+        with override_settings(AUTH_BASIC_DISABLED_PREFIXES=['/api/users/']):
+            self.assertEqual(self.me(self.basic()).status_code, 401)
+        self.assertEqual(self.me(self.basic()).status_code, 200)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class AsyncTokenViewTests(TransactionTestCase):
+    # Пароль проверяется в auth_executor, в другом потоке: нужна
+    # закоммиченная запись, а не транзакция TestCase.
+    def setUp(self):
+        self.user = make_user('user', password='secret-pass')
+        self.factory = AsyncRequestFactory()
+
+    def obtain(self, **data):
+        request = self.factory.post('/api/token/', data, content_type='application/json')
+        return async_to_sync(AsyncTokenObtainView.as_view())(request)
+
+    def test_obtain_with_valid_credentials(self):
+        response = self.obtain(email=self.user.email, password='secret-pass')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', json.loads(response.content))
+        self.assertIn('refresh_token', response.cookies)
+
+    def test_obtain_with_wrong_password(self):
+        response = self.obtain(email=self.user.email, password='wrong')
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(json.loads(response.content), {'error': 'invalid_data'})
+
+    def test_obtain_with_missing_fields(self):
+        self.assertEqual(self.obtain(email=self.user.email).status_code, 401)
+
+
+class AsyncEventViewTests(EventsAPITestCase):
+    # View вызываются напрямую: маршруты на них подключаются только при DJANGO_ASGI.
+    def setUp(self):
+        super().setUp()
+        self.factory = AsyncRequestFactory()
+        self.user = make_user('user')
+        self.auth = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+
+    def call(self, view, request, **kwargs):
+        response = async_to_sync(view.as_view())(request, **kwargs)
+        if hasattr(response, 'render'):
+            # Ответ делегированного ViewSet рендерит обработчик Django.
+            response.render()
+        return response, json.loads(response.content)
+
+    def test_list_is_paginated_and_cached(self):
+        events = [make_event() for _ in range(3)]
+        request = self.factory.get('/api/events/', {'page_size': 2})
+
+        response, body = self.call(AsyncEventListView, request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([event['id'] for event in body['results']], [event.pk for event in events[:2]])
+        self.assertIsNotNone(body['next'])
+
+        response, _ = self.call(AsyncEventListView, self.factory.get('/api/events/', {'page_size': 2}))
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_retrieve(self):
+        event = make_event(organizer=self.user)
+
+        response, body = self.call(
+            AsyncEventDetailView, self.factory.get(f'/api/events/{event.pk}/', {'expand': 'organizer'}),
+            pk=str(event.pk))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body['organizer']['email'], self.user.email)
+
+        response, _ = self.call(AsyncEventDetailView, self.factory.get('/api/events/999999/'), pk='999999')
+        self.assertEqual(response.status_code, 404)
+
+    def test_create(self):
+        request = self.factory.post('/api/events/', {
+            'title': 'Event', 'time': '2030-01-01T10:00:00Z', 'location': 'Hall',
+            'description': 'About', 'tags': 'x',
+        }, content_type='application/json', headers=self.auth)
+
+        response, body = self.call(AsyncEventListView, request)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(body['organizer'], self.user.pk)
+        self.assertEqual(body['participants'], [self.user.pk])
+
+    def test_create_requires_authentication(self):
+        request = self.factory.post('/api/events/', {'title': 'Event'}, content_type='application/json')
+
+        response, body = self.call(AsyncEventListView, request)
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(EventModel.objects.exists())
+
+    def test_update_is_delegated(self):
+        event = make_event()
+        request = self.factory.patch(
+            f'/api/events/{event.pk}/', {'title': 'New'}, content_type='application/json')
+
+        response, body = self.call(AsyncEventDetailView, request, pk=str(event.pk))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body['title'], 'New')
+
+
+@override_settings(MONITORING_TOKEN='monitoring-secret')
+class HealthTests(EventsAPITestCase):
+    def test_healthz(self):
+        response = self.client.get('/healthz')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'ok'})
+
+    def test_readyz_hides_details_from_anonymous(self):
+        response = self.client.get('/readyz')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'ok'})
+
+    def test_readyz_details_for_staff_and_token(self):
+        for header in ('Bearer monitoring-secret', None):
+            if header is None:
+                self.client.force_authenticate(make_user('admin', is_staff=True))
+            headers = {'Authorization': header} if header else {}
+            data = self.client.get('/readyz', headers=headers).json()
+            self.assertTrue(data['checks']['database']['ok'])
+            self.assertTrue(data['checks']['cache']['ok'])
+            self.assertIn('pool', data)
+
+
+class ParticipationAPITestCase(EventsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.users = [make_user(f'user{i}') for i in range(3)]
+
+    def post(self, event, action, user):
+        self.client.force_authenticate(user)
+        return self.client.post(f'/api/events/{event.pk}/{action}/')
+
+
+class EventParticipationTests(ParticipationAPITestCase):
+    def test_join_and_leave(self):
+        event = make_event()
+
+        response = self.post(event, 'join', self.users[0])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'id': event.pk, 'status': 'joined', 'joined': True, 'participants_count': 1})
+        self.assertEqual(self.post(event, 'join', self.users[0]).json()['status'], 'already_joined')
+
+        response = self.post(event, 'leave', self.users[0])
+        self.assertEqual(response.json()['status'], 'left')
+        self.assertEqual(response.json()['participants_count'], 0)
+        self.assertEqual(self.post(event, 'leave', self.users[0]).json()['status'], 'not_joined')
+
+    def test_join_requires_authentication(self):
+        event = make_event()
+        self.assertEqual(self.client.post(f'/api/events/{event.pk}/join/').status_code, 401)
+
+
+class EventWaitlistTests(ParticipationAPITestCase):
+    def test_full_event_without_waitlist(self):
+        event = make_event(max_participants=1)
+        self.post(event, 'join', self.users[0])
+
+        response = self.post(event, 'join', self.users[1])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json(), {'error': 'event_full', 'participants_count': 1})
+
+    def test_waitlisted_user_takes_freed_seat(self):
+        event = make_event(max_participants=1, waitlist_enabled=True)
+        self.post(event, 'join', self.users[0])
+
+        response = self.post(event, 'join', self.users[1])
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], 'waitlisted')
+        self.assertFalse(response.json()['joined'])
+
+        self.post(event, 'leave', self.users[0])
+        self.assertEqual(list(event.joined_users.values_list('pk', flat=True)), [self.users[1].pk])
+        self.assertFalse(event.waitlist.exists())
+
+    def test_raising_capacity_promotes_waitlist(self):
+        event = make_event(max_participants=1, waitlist_enabled=True)
+        for user in self.users:
+            self.post(event, 'join', user)
+
+        response = self.client.patch(f'/api/events/{event.pk}/', {'max_participants': 2}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(event.joined_users.order_by('pk').values_list('pk', flat=True)),
+            [self.users[0].pk, self.users[1].pk])
+        self.assertEqual(list(event.waitlist.values_list('user_id', flat=True)), [self.users[2].pk])
+
+
+class SparseFieldsTests(EventsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.organizer = make_user('organizer')
+        self.users = [make_user(f'user{i}') for i in range(3)]
+        self.event = make_event(organizer=self.organizer)
+        self.event.joined_users.set(self.users)
+        self.url = f'/api/events/{self.event.pk}/'
+
+    def test_fields_limit_response(self):
+        response = self.client.get(self.url, {'fields': 'title,time'})
+        self.assertEqual(set(response.json()), {'id', 'title', 'time'})
+
+    def test_unknown_fields_and_expand_are_rejected(self):
+        self.assertIn('fields', self.client.get(self.url, {'fields': 'secret'}).json())
+        self.assertIn('expand', self.client.get(self.url, {'expand': 'tags'}).json())
+
+    def test_expand_embeds_users(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual(data['organizer'], self.organizer.pk)
+        self.assertEqual(data['participants'], [user.pk for user in self.users])
+
+        data = self.client.get(self.url, {'expand': 'organizer,participants'}).json()
+        self.assertEqual(data['organizer']['email'], self.organizer.email)
+        self.assertEqual([user['id'] for user in data['participants']], [user.pk for user in self.users])
+        self.assertNotIn('password', data['organizer'])
+
+
+class ParticipantsResourceTests(EventsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.users = [make_user(f'user{i}') for i in range(3)]
+        self.event = make_event()
+        self.event.joined_users.set(self.users)
+
+    def test_event_participants_are_paginated(self):
+        body = self.client.get(f'/api/events/{self.event.pk}/participants/', {'page_size': 2}).json()
+        self.assertEqual([user['id'] for user in body['results']], [user.pk for user in self.users[:2]])
+        self.assertEqual(
+            [user['id'] for user in self.client.get(body['next']).json()['results']], [self.users[2].pk])
+        self.assertEqual(self.client.get('/api/events/999999/participants/').status_code, 404)
+
+    @override_settings(EVENT_PARTICIPANTS_PREVIEW=2)
+    def test_participants_preview_is_limited(self):
+        event = self.client.get('/api/events/').json()['results'][0]
+        self.assertEqual(event['participants'], [user.pk for user in self.users[:2]])
+        self.assertEqual(event['participants_count'], 3)
+
+
+class MyEventsTests(EventsAPITestCase):
+    def test_my_events_by_role(self):
+        user = make_user('user')
+        joined = make_event()
+        joined.joined_users.add(user)
+        organized = make_event(organizer=user)
+        make_event()
+
+        self.client.force_authenticate(user)
+        self.assertEqual(self.event_ids('/api/users/me/events/'), [joined.pk])
+        response = self.client.get('/api/users/me/events/', {'role': 'organized', 'fields': 'title'})
+        self.assertEqual(response.json()['results'], [{'id': organized.pk, 'title': 'Event'}])
+        self.assertEqual(self.client.get('/api/users/me/events/', {'role': 'all'}).status_code, 400)
+
+    def test_my_events_requires_authentication(self):
+        self.assertEqual(self.client.get('/api/users/me/events/').status_code, 401)
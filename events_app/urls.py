@@ -1,9 +1,16 @@
+from django.conf import settings
 from django.urls import path, include, re_path
 from djangoProject.custom_router import EnhancedAPIRouter
 from rest_framework.routers import APIRootView
-from events_app.api.views.events import EventViewSet
+from events_app.api.views.events import (
+    AsyncEventDetailView, AsyncEventListView, EventParticipantViewSet, EventViewSet)
+from events_app.api.views.health import healthz, readyz
+from events_app.api.views.metrics import metrics
 from events_app.api.views.users import UserViewSet
-from events_app.api.views.users import CustomTokenObtainView, CustomTokenRefreshView
+from events_app.api.views.users import (
+    AsyncTokenObtainView, AsyncTokenRefreshView,
+    AsyncUserDetailView, AsyncUserListView,
+    CustomTokenObtainView, CustomTokenRefreshView)
 
 
 class HubAPIRootView(APIRootView):
@@ -17,12 +24,33 @@ router = EnhancedAPIRouter()
 router.APIRootView = HubAPIRootView
 
 router.register('events', EventViewSet, 'event')
+router.register(r'events/(?P<event_pk>[0-9]+)/participants', EventParticipantViewSet, 'event-participant')
 router.register('users', UserViewSet, 'user')
 
-urlpatterns = [
+if settings.ASGI_MODE:
+    token_obtain_view = AsyncTokenObtainView.as_view()
+    token_refresh_view = AsyncTokenRefreshView.as_view()
+    # Перед роутером: list/retrieve/create обслуживаются нативно
+    # асинхронно, остальные маршруты (me, ...) остаются за ViewSet.
+    async_patterns = [
+        # Имена те же, что у роутера: по ним размечаются метрики.
+        path('api/events/', AsyncEventListView.as_view(), name='event-list'),
+        re_path(r'^api/events/(?P<pk>[0-9]+)/$', AsyncEventDetailView.as_view(), name='event-detail'),
+        path('api/users/', AsyncUserListView.as_view(), name='user-list'),
+        re_path(r'^api/users/(?P<pk>[0-9]+)/$', AsyncUserDetailView.as_view(), name='user-detail'),
+    ]
+else:
+    token_obtain_view = CustomTokenObtainView.as_view()
+    token_refresh_view = CustomTokenRefreshView.as_view()
+    async_patterns = []
+
+urlpatterns = async_patterns + [
     path('api/', include(router.urls)),
-    path('api/token/', CustomTokenObtainView.as_view(), name='token_obtain_pair'),
-    path('api/token/refresh/', CustomTokenRefreshView.as_view(), name='token_refresh'),
+    path('api/token/', token_obtain_view, name='token_obtain_pair'),
+    path('api/token/refresh/', token_refresh_view, name='token_refresh'),
+    path('healthz', healthz, name='healthz'),
+    path('readyz', readyz, name='readyz'),
+    path('metrics', metrics, name='metrics'),
     re_path(r'^auth/', include('djoser.urls')),
     re_path(r'^auth/', include('djoser.urls.jwt')),
 ]
\ No newline at end of file
@@ -0,0 +1,259 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.utils.crypto import constant_time_compare
+from rest_framework.authentication import (
+    BaseAuthentication, BasicAuthentication, SessionAuthentication, get_authorization_header)
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class TTLLRUCache:
+    """
+    Потокобезопасный LRU-кэш ограниченного размера с временем жизни записей.
+
+    Args:
+        maxsize: Максимальное число записей, старые вытесняются первыми
+        ttl: Время жизни записи в секундах, 0 отключает кэш
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class AuthTimings:
+    """Число вызовов и суммарное время аутентификации по схемам в процессе."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: dict[str, list[float]] = {}
+
+    def record(self, scheme: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._data.setdefault(scheme, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {
+                scheme: {'count': count, 'total': total, 'max': maximum}
+                for scheme, (count, total, maximum) in self._data.items()
+            }
+
+
+auth_timings = AuthTimings()
+
+user_cache = TTLLRUCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL)
+
+
+def user_cache_key(user_id: Any) -> str:
+    return str(user_id)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication, который не ходит в БД за пользователем на каждый запрос.
+
+    Пользователи кэшируются по claim'у user_id в пределах процесса.
+    Сохранение и удаление CustomUser сбрасывает запись (events_app.signals),
+    изменения в обход save() (queryset.update) видны не позже чем через
+    AUTH_USER_CACHE_TTL секунд; столько же живут изменения из других воркеров.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        key = user_cache_key(user_id)
+        user = user_cache.get(key)
+        if user is None:
+            # Неактивные и несуществующие пользователи в кэш не попадают:
+            # родительский метод бросит исключение раньше.
+            user = super().get_user(validated_token)
+            user_cache.set(key, user)
+        else:
+            self.check_revoked(user, validated_token)
+
+        # Копия, чтобы запросы не делили один объект и его кэши связей.
+        return copy.copy(user)
+
+    def check_revoked(self, user, validated_token) -> None:
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                "The user's password has been changed.", code="password_changed")
+
+    async def aauthenticate(self, request):
+        """Асинхронный authenticate(): при промахе кэша пользователь читается через aget()."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            # Без claim'а родитель бросит InvalidToken, не обращаясь к БД.
+            return super().get_user(validated_token)
+
+        key = user_cache_key(user_id)
+        user = user_cache.get(key)
+        if user is None:
+            try:
+                user = await self.user_model.objects.aget(
+                    **{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed("User not found", code="user_not_found") from e
+
+            if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+                raise AuthenticationFailed("User is inactive", code="user_inactive")
+            self.check_revoked(user, validated_token)
+            user_cache.set(key, user)
+        else:
+            self.check_revoked(user, validated_token)
+
+        return copy.copy(user)
+
+
+class SchemeDispatchAuthentication(BaseAuthentication):
+    """
+    Выбирает один способ аутентификации по запросу вместо перебора всех.
+
+    ``Authorization: Bearer`` - CachedJWTAuthentication, ``Authorization: Basic`` -
+    BasicAuthentication (кроме путей из AUTH_BASIC_DISABLED_PREFIXES), без
+    заголовка, но с cookie сессии - SessionAuthentication. Время каждой
+    схемы пишется в auth_timings.
+    """
+
+    def __init__(self):
+        self.jwt = CachedJWTAuthentication()
+        self.backends = {
+            'bearer': self.jwt,
+            'basic': BasicAuthentication(),
+            'session': SessionAuthentication(),
+        }
+        self.bearer_types = {
+            header_type.lower().encode() for header_type in api_settings.AUTH_HEADER_TYPES
+        }
+
+    def select_scheme(self, request) -> str | None:
+        header = request.META.get(api_settings.AUTH_HEADER_NAME, '')
+        if isinstance(header, str):
+            header = header.encode('iso-8859-1')
+
+        if header:
+            scheme = header.split(None, 1)[0].lower()
+            if scheme in self.bearer_types:
+                return 'bearer'
+            if scheme == b'basic':
+                if request.path.startswith(tuple(settings.AUTH_BASIC_DISABLED_PREFIXES)):
+                    raise AuthenticationFailed('Basic authentication is disabled for this endpoint.')
+                return 'basic'
+            return None
+
+        if settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return 'session'
+        return None
+
+    def authenticate(self, request):
+        scheme = self.select_scheme(request)
+        if scheme is None:
+            return None
+
+        start = time.perf_counter()
+        try:
+            return self.backends[scheme].authenticate(request)
+        finally:
+            auth_timings.record(scheme, time.perf_counter() - start)
+
+    async def aauthenticate(self, request):
+        scheme = self.select_scheme(request)
+        if scheme is None:
+            return None
+
+        start = time.perf_counter()
+        try:
+            if scheme == 'bearer':
+                return await self.jwt.aauthenticate(request)
+            # Basic и сессия синхронные (PBKDF2, хранилище сессий).
+            return await sync_to_async(self.backends[scheme].authenticate)(request)
+        finally:
+            auth_timings.record(scheme, time.perf_counter() - start)
+
+    def authenticate_header(self, request):
+        return self.jwt.authenticate_header(request)
+
+
+class MonitoringTokenAuthentication(BaseAuthentication):
+    """
+    ``Authorization: Bearer <MONITORING_TOKEN>`` для скрейпера и проб.
+
+    Пользователя за токеном нет (AnonymousUser); права дает
+    IsStaffOrMonitoring. Чужой Bearer уходит дальше, к JWT.
+    """
+
+    def authenticate(self, request):
+        token = settings.MONITORING_TOKEN
+        if not token:
+            return None
+        auth = get_authorization_header(request).split()
+        if len(auth) != 2 or auth[0].lower() != b'bearer':
+            return None
+        if not constant_time_compare(auth[1], token.encode()):
+            return None
+        return AnonymousUser(), None
+
+    def authenticate_header(self, request):
+        return 'Bearer realm="monitoring"'
@@ -0,0 +1,58 @@
+import math
+import os
+import statistics
+import tempfile
+from contextlib import contextmanager
+
+from django.db import connections
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Перцентиль методом nearest-rank, p в диапазоне 0..100."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: list[float]) -> dict[str, float]:
+    """Сводка по задержкам в миллисекундах."""
+    return {
+        'count': len(latencies),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'max_ms': round(max(latencies, default=0.0) * 1000, 3),
+    }
+
+
+@contextmanager
+def benchmark_database(alias: str = 'default', verbosity: int = 0):
+    """
+    Поднимает временную тестовую БД на время бенчмарка.
+
+    Для SQLite используется файл, а не память: бенчмарки ходят в БД
+    из нескольких потоков.
+    """
+    connection = connections[alias]
+    tmp_dir = None
+    if connection.vendor == 'sqlite':
+        tmp_dir = tempfile.TemporaryDirectory()
+        connection.settings_dict['TEST']['NAME'] = os.path.join(tmp_dir.name, 'bench.sqlite3')
+        # Пишущие транзакции сразу берут блокировку и ждут друг друга,
+        # а не падают с "database is locked" при повышении блокировки.
+        connection.settings_dict['OPTIONS'].setdefault('transaction_mode', 'IMMEDIATE')
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(
+        verbosity=verbosity, autoclobber=True, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity)
+        teardown_test_environment()
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
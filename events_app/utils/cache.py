@@ -0,0 +1,160 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+# Версии в ключах: смена версии делает старые записи недостижимыми,
+# удалять их не нужно - дотухнут по таймауту.
+GLOBAL_VERSION_KEY = 'events:version'
+LIST_VERSION_KEY = 'events:list:version'
+EVENT_VERSION_KEY = 'events:detail:{pk}:version'
+
+
+class CacheStats:
+    """Счетчики попаданий/промахов кэша событий в текущем процессе."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+
+cache_stats = CacheStats()
+
+
+def get_cache():
+    return caches[settings.EVENTS_CACHE_ALIAS]
+
+
+def _bump(cache, key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Ключа нет (первая инвалидация или вытеснение): любая новая
+        # версия отличается от отсутствующей.
+        cache.set(key, 2, None)
+
+
+def _versions(cache, *keys: str) -> str:
+    values = cache.get_many(keys)
+    return '.'.join(str(values.get(key, 1)) for key in keys)
+
+
+async def _aversions(cache, *keys: str) -> str:
+    values = await cache.aget_many(keys)
+    return '.'.join(str(values.get(key, 1)) for key in keys)
+
+
+def _request_digest(request) -> str:
+    return hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+
+
+def event_list_key(request) -> str:
+    cache = get_cache()
+    versions = _versions(cache, GLOBAL_VERSION_KEY, LIST_VERSION_KEY)
+    return f'events:list:{versions}:{_request_digest(request)}'
+
+
+def event_detail_key(request, pk) -> str:
+    cache = get_cache()
+    versions = _versions(cache, GLOBAL_VERSION_KEY, EVENT_VERSION_KEY.format(pk=pk))
+    return f'events:detail:{pk}:{versions}:{_request_digest(request)}'
+
+
+async def aevent_list_key(request) -> str:
+    versions = await _aversions(get_cache(), GLOBAL_VERSION_KEY, LIST_VERSION_KEY)
+    return f'events:list:{versions}:{_request_digest(request)}'
+
+
+async def aevent_detail_key(request, pk) -> str:
+    versions = await _aversions(get_cache(), GLOBAL_VERSION_KEY, EVENT_VERSION_KEY.format(pk=pk))
+    return f'events:detail:{pk}:{versions}:{_request_digest(request)}'
+
+
+async def acached(key: str, build) -> tuple[object, bool]:
+    """
+    Асинхронный аналог EventCacheMixin.cached_response.
+
+    build - корутина-функция, возвращающая данные ответа.
+    Возвращает (данные, было ли попадание в кэш).
+    """
+    cache = get_cache()
+    data = await cache.aget(key)
+    if data is not None:
+        cache_stats.hit()
+        return data, True
+
+    cache_stats.miss()
+    data = await build()
+    await cache.aset(key, data, settings.EVENTS_CACHE_TIMEOUT)
+    return data, False
+
+
+def invalidate_events(*pks) -> None:
+    """Сбрасывает список событий и карточки перечисленных событий."""
+
+    def bump():
+        cache = get_cache()
+        _bump(cache, LIST_VERSION_KEY)
+        for pk in pks:
+            _bump(cache, EVENT_VERSION_KEY.format(pk=pk))
+
+    # После коммита: иначе параллельный запрос успеет закэшировать
+    # старые данные уже под новой версией.
+    transaction.on_commit(bump)
+
+
+def invalidate_all_events() -> None:
+    """Сбрасывает все ответы по событиям (например, при изменении пользователя)."""
+    transaction.on_commit(lambda: _bump(get_cache(), GLOBAL_VERSION_KEY))
+
+
+class EventCacheMixin:
+    """
+    Кэширует ответы list/retrieve во view событий.
+
+    Ключ строится по полному URL и версиям, которые поднимают сигналы
+    из events_app.signals. В ответ добавляется заголовок X-Cache.
+    """
+
+    def cached_response(self, key, handler, request, *args, **kwargs):
+        cache = get_cache()
+        data = cache.get(key)
+        if data is not None:
+            cache_stats.hit()
+            return Response(data, headers={'X-Cache': 'HIT'})
+
+        cache_stats.miss()
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.EVENTS_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            event_list_key(request), super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            pk = int(kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except (TypeError, ValueError):
+            return super().retrieve(request, *args, **kwargs)
+        return self.cached_response(
+            event_detail_key(request, pk), super().retrieve, request, *args, **kwargs)
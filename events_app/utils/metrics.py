@@ -0,0 +1,124 @@
+import atexit
+import os
+import threading
+import time
+
+from django.conf import settings
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess)
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Метрики пишутся в mmap-файлы процесса в PROMETHEUS_MULTIPROC_DIR
+# (его выставляет settings из METRICS_DIR), /metrics их суммирует.
+REQUESTS = Counter(
+    'http_requests_total', 'HTTP-запросы по маршруту, методу и статусу.',
+    ('route', 'method', 'status'))
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Время обработки запроса.', ('route', 'method'))
+REQUEST_ERRORS = Counter(
+    'http_request_errors_total', 'Ответы 5xx.', ('route', 'method'))
+DB_QUERIES = Counter(
+    'http_db_queries_total', 'SQL-запросы, выполненные при обработке HTTP-запросов.', ('route',))
+DB_SECONDS = Counter(
+    'http_db_seconds_total', 'Время SQL-запросов при обработке HTTP-запросов.', ('route',))
+POOL_CONNECTIONS = Gauge(
+    'db_pool_connections', 'Соединения пула psycopg по состоянию, сумма по живым процессам.',
+    ('state',), multiprocess_mode='livesum')
+POOL_ERRORS = Gauge(
+    'db_pool_errors', 'Ошибки получения соединения из пула, сумма по живым процессам.',
+    multiprocess_mode='livesum')
+CACHE_REQUESTS = Counter(
+    'events_cache_requests_total', 'Обращения к кэшу событий.', ('result',))
+AUTH_REQUESTS = Counter(
+    'auth_requests_total', 'Аутентификации по схемам.', ('scheme',))
+AUTH_SECONDS = Counter(
+    'auth_seconds_total', 'Время аутентификации по схемам.', ('scheme',))
+
+_synced_at = 0.0
+_sync_lock = threading.Lock()
+# Последние перенесенные в счетчики значения статистики процесса.
+_totals: dict[tuple, float] = {}
+
+
+def observe_request(route: str, method: str, status: int, seconds: float,
+                    queries: int = 0, db_seconds: float = 0.0) -> None:
+    REQUESTS.labels(route, method, str(status)).inc()
+    REQUEST_DURATION.labels(route, method).observe(seconds)
+    if status >= 500:
+        REQUEST_ERRORS.labels(route, method).inc()
+    if queries:
+        DB_QUERIES.labels(route).inc(queries)
+        DB_SECONDS.labels(route).inc(db_seconds)
+    sync_process_stats()
+
+
+def set_total(counter: Counter, value: float, *labelvalues) -> None:
+    """
+    Доводит счетчик до значения, которое процесс уже ведет сам (кэш, auth).
+
+    Вызывать под _sync_lock: иначе два потока прибавят одну и ту же дельту.
+    """
+    key = (counter, labelvalues)
+    delta = value - _totals.get(key, 0.0)
+    if delta > 0:
+        counter.labels(*labelvalues).inc(delta)
+    _totals[key] = value
+
+
+def sync_process_stats(force: bool = False) -> None:
+    """
+    Переносит в метрики статистику пула, кэша и аутентификации процесса.
+
+    Вызывается из запросов не чаще METRICS_SYNC_INTERVAL: сами объекты
+    статистики берут свои блокировки, и скрейп их не трогает. Если синхронизацию
+    уже выполняет другой поток, запрос ее просто пропускает.
+    """
+    global _synced_at
+    now = time.monotonic()
+    if not force and now - _synced_at < settings.METRICS_SYNC_INTERVAL:
+        return
+    # Скрейп (force) дожидается текущей синхронизации, запросы нет.
+    if not _sync_lock.acquire(blocking=force):
+        return
+    try:
+        if not force and now - _synced_at < settings.METRICS_SYNC_INTERVAL:
+            return
+        _synced_at = now
+        _sync()
+    finally:
+        _sync_lock.release()
+
+
+def _sync() -> None:
+    from djangoProject.db import pool_stats
+    from events_app.utils.authentication import auth_timings
+    from events_app.utils.cache import cache_stats
+
+    pool = pool_stats()
+    if pool['enabled']:
+        for state in ('size', 'in_use', 'available', 'waiting'):
+            POOL_CONNECTIONS.labels(state).set(pool[state])
+        POOL_ERRORS.set(pool['errors'])
+
+    cache = cache_stats.snapshot()
+    set_total(CACHE_REQUESTS, cache['hits'], 'hit')
+    set_total(CACHE_REQUESTS, cache['misses'], 'miss')
+    for scheme, stats in auth_timings.snapshot().items():
+        set_total(AUTH_REQUESTS, stats['count'], scheme)
+        set_total(AUTH_SECONDS, stats['total'], scheme)
+
+def render() -> bytes:
+    """Метрики всех процессов в текстовом формате Prometheus."""
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def mark_process_dead() -> None:
+    # livesum-гейджи завершившегося процесса не должны попадать в сумму.
+    multiprocess.mark_process_dead(os.getpid())
+
+
+if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+    atexit.register(mark_process_dead)
@@ -0,0 +1,109 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Keyset-пагинация по первичному ключу.
+
+    Страница выбирается условием ``id > <курсор>`` по индексу PK, поэтому
+    стоимость запроса не зависит от глубины листания, а COUNT(*) не
+    выполняется вовсе. Курсор непрозрачный (base64), размер страницы
+    задается через ``?page_size=`` и ограничен API_MAX_PAGE_SIZE.
+
+    Повторяет CursorPagination.paginate_queryset, но разделяет его на
+    построение запроса и разбор страницы, чтобы страницу можно было
+    выбрать и асинхронно (apaginate_queryset).
+    """
+
+    ordering = ('id',)
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        results = [
+            obj async for obj in queryset.aiterator(chunk_size=self.page_size + 1)
+        ]
+        return self.set_page(results)
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Возвращает ленивый queryset страницы (плюс один элемент) или None."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+        self.page_offset = offset
+        self.page_reverse = reverse
+        self.current_position = current_position
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            order = self.ordering[0]
+            is_reversed = order.startswith('-')
+            order_attr = order.lstrip('-')
+
+            if self.cursor.reverse != is_reversed:
+                kwargs = {order_attr + '__lt': current_position}
+            else:
+                kwargs = {order_attr + '__gt': current_position}
+
+            queryset = queryset.filter(**kwargs)
+
+        return queryset[offset:offset + self.page_size + 1]
+
+    def set_page(self, results):
+        """Разбирает выборку страницы и вычисляет позиции соседних курсоров."""
+        offset = self.page_offset
+        current_position = self.current_position
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if self.page_reverse:
+            self.page = list(reversed(self.page))
+
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
@@ -1,6 +1,8 @@
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import BasePermission, IsAuthenticated
 from rest_framework.exceptions import AuthenticationFailed
 
+from events_app.utils.authentication import MonitoringTokenAuthentication
+
 
 class CustomIsAuthenticated(IsAuthenticated):
     def has_permission(self, request, view):
@@ -11,3 +13,12 @@ class CustomIsAuthenticated(IsAuthenticated):
             raise AuthenticationFailed("Authentication credentials were not provided")
 
         return True
+
+
+class IsStaffOrMonitoring(BasePermission):
+    """Staff-пользователь или запрос с MONITORING_TOKEN."""
+
+    def has_permission(self, request, view):
+        if isinstance(request.successful_authenticator, MonitoringTokenAuthentication):
+            return True
+        return bool(request.user and request.user.is_staff)
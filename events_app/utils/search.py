@@ -0,0 +1,170 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField, Value
+from django.db.models.expressions import RawSQL
+
+# Конфигурация PostgreSQL для to_tsvector/websearch_to_tsquery.
+SEARCH_CONFIG = 'russian'
+
+EVENT_TABLE = 'events_app_eventmodel'
+FTS_TABLE = 'events_app_event_fts'
+
+# Веса полей: title важнее location, location важнее description.
+FTS_WEIGHTS = (10.0, 5.0, 1.0)
+
+FTS_TOKEN = re.compile(r'\w+')
+
+POSTGRES_INSTALL = (
+    f"""
+    CREATE OR REPLACE FUNCTION events_app_event_search_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.location, '')), 'B') ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.description, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    f"DROP TRIGGER IF EXISTS events_app_event_search_update ON {EVENT_TABLE}",
+    f"""
+    CREATE TRIGGER events_app_event_search_update
+    BEFORE INSERT OR UPDATE ON {EVENT_TABLE}
+    FOR EACH ROW EXECUTE FUNCTION events_app_event_search_update()
+    """,
+    f"""
+    CREATE INDEX IF NOT EXISTS events_app_event_search_vector_idx
+    ON {EVENT_TABLE} USING gin (search_vector)
+    """,
+    # Пустое обновление прогоняет строку через триггер.
+    f"UPDATE {EVENT_TABLE} SET title = title WHERE search_vector IS NULL",
+)
+
+POSTGRES_UNINSTALL = (
+    "DROP INDEX IF EXISTS events_app_event_search_vector_idx",
+    f"DROP TRIGGER IF EXISTS events_app_event_search_update ON {EVENT_TABLE}",
+    "DROP FUNCTION IF EXISTS events_app_event_search_update()",
+)
+
+SQLITE_TRIGGERS = {
+    'events_app_event_fts_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS events_app_event_fts_ai AFTER INSERT ON {EVENT_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title, location, description)
+            VALUES (new.id, new.title, new.location, new.description);
+        END
+    """,
+    'events_app_event_fts_ad': f"""
+        CREATE TRIGGER IF NOT EXISTS events_app_event_fts_ad AFTER DELETE ON {EVENT_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, location, description)
+            VALUES ('delete', old.id, old.title, old.location, old.description);
+        END
+    """,
+    'events_app_event_fts_au': f"""
+        CREATE TRIGGER IF NOT EXISTS events_app_event_fts_au
+        AFTER UPDATE OF title, location, description ON {EVENT_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, location, description)
+            VALUES ('delete', old.id, old.title, old.location, old.description);
+            INSERT INTO {FTS_TABLE}(rowid, title, location, description)
+            VALUES (new.id, new.title, new.location, new.description);
+        END
+    """,
+}
+
+
+def install_search_backend(connection) -> None:
+    """
+    Создает индекс полнотекстового поиска событий.
+
+    PostgreSQL: триггер заполняет EventModel.search_vector, поверх него
+    GIN-индекс. SQLite: FTS5-таблица с внешним содержимым и триггеры
+    синхронизации. Операция идемпотентна.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            for sql in POSTGRES_INSTALL:
+                cursor.execute(sql)
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s",
+                [EVENT_TABLE],
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"title, location, description, "
+                f"content='{EVENT_TABLE}', content_rowid='id', "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            )
+            for sql in SQLITE_TRIGGERS.values():
+                cursor.execute(sql)
+
+            # Триггеры пропадают, когда SQLite пересоздает таблицу при
+            # миграции; изменения за это время восстанавливаем перестройкой.
+            if not existing.issuperset(SQLITE_TRIGGERS):
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def uninstall_search_backend(connection) -> None:
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            for sql in POSTGRES_UNINSTALL:
+                cursor.execute(sql)
+        elif connection.vendor == 'sqlite':
+            for name in SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def ensure_search_backend(sender, app_config=None, using='default', apps=None, **kwargs):
+    """post_migrate: возвращает триггеры FTS5 после пересоздания таблицы."""
+    if apps is None:
+        return
+    try:
+        event_model = apps.get_model('events_app', 'EventModel')
+    except LookupError:
+        return
+    if not any(field.name == 'search_vector' for field in event_model._meta.fields):
+        return
+    install_search_backend(connections[using])
+
+
+def to_fts_query(text: str) -> str:
+    """Превращает пользовательский ввод в безопасный запрос FTS5 (AND по префиксам)."""
+    return ' '.join(f'"{token}"*' for token in FTS_TOKEN.findall(text))
+
+
+def search_events(queryset, text: str):
+    """
+    Фильтрует события по словам из title/location/description и
+    аннотирует их релевантностью ``rank`` (больше - лучше).
+    """
+    connection = connections[queryset.db]
+
+    if connection.vendor == 'postgresql':
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+        return queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F('search_vector'), query),
+        )
+
+    match = to_fts_query(text)
+    if not match:
+        return queryset.annotate(rank=Value(0.0, output_field=FloatField())).none()
+
+    weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+    return queryset.filter(
+        id__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+            [match],
+        )
+    ).annotate(
+        # bm25() отрицательный: чем меньше, тем релевантнее.
+        rank=RawSQL(
+            f"SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = {EVENT_TABLE}.id",
+            [match],
+            output_field=FloatField(),
+        ),
+    )
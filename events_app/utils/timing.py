@@ -0,0 +1,81 @@
+import heapq
+import re
+import time
+from contextvars import ContextVar
+from operator import itemgetter
+
+# Строковые и числовые литералы, плейсхолдеры драйверов.
+SQL_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s|\?")
+SQL_IN_LISTS = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+
+
+class RequestTimings:
+    """Время запроса по частям: SQL и сериализация."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db = 0.0
+        self.serialize = 0.0
+        self.queries: list[tuple[float, str]] = []
+        self.serializing = False
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def slowest_queries(self, limit: int) -> list[tuple[float, str]]:
+        return heapq.nlargest(limit, self.queries, key=itemgetter(0))
+
+
+# Сборщик текущего запроса; None - замер выключен.
+current_timings: ContextVar[RequestTimings | None] = ContextVar('request_timings', default=None)
+
+
+def normalize_sql(sql: str) -> str:
+    """SQL без значений: литералы -> ?, списки IN (?, ?, ...) -> (...)."""
+    sql = SQL_LITERALS.sub('?', sql)
+    sql = SQL_IN_LISTS.sub('(...)', sql)
+    return ' '.join(sql.split())
+
+
+def record_query(execute, sql, params, many, context):
+    """execute_wrapper: время запроса в сборщик текущего запроса."""
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        timings.db += elapsed
+        timings.queries.append((elapsed, sql))
+
+
+def install_query_timer(sender=None, connection=None, **kwargs):
+    """Обработчик connection_created: один record_query на соединение."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedSerializerMixin:
+    """
+    Суммирует время to_representation в сборщик запроса.
+
+    Считается только внешний сериализатор: вложенные (участники
+    в событии) уже входят в его время.
+    """
+
+    def to_representation(self, instance):
+        timings = current_timings.get()
+        if timings is None or timings.serializing:
+            return super().to_representation(instance)
+
+        timings.serializing = True
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            timings.serialize += time.perf_counter() - start
+            timings.serializing = False
@@ -0,0 +1,22 @@
+#!/bin/sh
+
+# ASGI-режим: list/retrieve/create событий и пользователей, а также
+# выдача токенов обслуживаются асинхронными view, поэтому один процесс
+# держит сотни одновременных медленных клиентов.
+# uvicorn не входит в uv.lock и подтягивается через --with.
+
+set -e
+
+uv run manage.py wait_for_db
+uv run manage.py fast_start
+
+# Файлы метрик прошлого запуска не должны суммироваться с новыми.
+rm -rf "${METRICS_DIR:-${TMPDIR:-/tmp}/uniplace-metrics}"
+
+
+exec uv run --with uvicorn uvicorn djangoProject.asgi:application \
+  --host 0.0.0.0 \
+  --port 9000 \
+  --workers "${ASGI_WORKERS:-1}" \
+  --timeout-keep-alive 5 \
+  --no-access-log
@@ -3,15 +3,17 @@
 set -e
 
 uv run manage.py wait_for_db
-uv run manage.py makemigrations
-uv run manage.py migrate
-uv run manage.py collectstatic --noinput
+uv run manage.py fast_start
+
+# Файлы метрик прошлого запуска не должны суммироваться с новыми.
+rm -rf "${METRICS_DIR:-${TMPDIR:-/tmp}/uniplace-metrics}"
 
 
 exec uwsgi \
   --chdir /djangoapp \
   --module djangoProject.wsgi \
   --master \
+  --lazy-apps \
   --workers 1 \
   --threads 2 \
   --enable-threads \